@@ -0,0 +1,144 @@
+"""
+Catalog version tracking for in-process search structures.
+
+The scraper bumps a single version number in the catalog_state table whenever
+it writes card data. Workers cache the number for Config.CATALOG_VERSION_TTL
+seconds, so anything derived from the catalog (search index, result caches,
+filter value lists) can check for staleness without a query per request.
+"""
+
+import functools
+import threading
+import time
+from datetime import datetime
+
+from flask import make_response, request
+from sqlalchemy import text
+
+from config import Config
+from database import get_session
+
+CATALOG_STATE_ID = 1
+
+_lock = threading.Lock()
+_cached_version = None
+_checked_at = 0.0
+
+
+def _read_version(db_session):
+    row = db_session.execute(
+        text("SELECT version FROM catalog_state WHERE id = :id"),
+        {"id": CATALOG_STATE_ID},
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def get_catalog_version():
+    """Get the current catalog version (re-read at most every TTL seconds)."""
+    global _cached_version, _checked_at
+
+    now = time.monotonic()
+    if _cached_version is not None and now - _checked_at < Config.CATALOG_VERSION_TTL:
+        return _cached_version
+
+    with _lock:
+        if (
+            _cached_version is not None
+            and time.monotonic() - _checked_at < Config.CATALOG_VERSION_TTL
+        ):
+            return _cached_version
+
+        db_session = get_session()
+        try:
+            _cached_version = _read_version(db_session)
+        finally:
+            db_session.close()
+        _checked_at = time.monotonic()
+        return _cached_version
+
+
+def bump_catalog_version(db_session=None):
+    """Increment the catalog version after card data changed.
+
+    Args:
+        db_session: Optional session to bump within (committed by the caller);
+            when omitted a new session is opened and committed here.
+
+    Returns:
+        int: The new version
+    """
+    global _cached_version, _checked_at
+
+    own_session = db_session is None
+    if own_session:
+        db_session = get_session()
+
+    try:
+        updated = db_session.execute(
+            text(
+                "UPDATE catalog_state SET version = version + 1, updated_at = :now "
+                "WHERE id = :id"
+            ),
+            {"id": CATALOG_STATE_ID, "now": datetime.utcnow()},
+        ).rowcount
+        if not updated:
+            db_session.execute(
+                text(
+                    "INSERT INTO catalog_state (id, version, updated_at) "
+                    "VALUES (:id, 2, :now)"
+                ),
+                {"id": CATALOG_STATE_ID, "now": datetime.utcnow()},
+            )
+        version = _read_version(db_session)
+        if own_session:
+            db_session.commit()
+    except Exception:
+        if own_session:
+            db_session.rollback()
+        raise
+    finally:
+        if own_session:
+            db_session.close()
+
+    # This process sees its own bump immediately
+    with _lock:
+        _cached_version = version
+        _checked_at = time.monotonic()
+    return version
+
+
+def catalog_etag(version):
+    """Get the (weak) entity tag for responses derived from a catalog version."""
+    if Config.API_REVISION:
+        return f"catalog-{version}-{Config.API_REVISION}"
+    return f"catalog-{version}"
+
+
+def conditional_on_catalog(view):
+    """Serve a catalog-derived route with an ETag of the catalog version.
+
+    A request whose If-None-Match already holds the current tag gets a 304
+    before the view runs, so revalidating costs no query beyond the (cached)
+    version check. Responses may be reused for Config.CATALOG_CACHE_MAX_AGE
+    seconds before clients and CDNs revalidate; errors are sent uncached.
+    """
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        etag = catalog_etag(get_catalog_version())
+        if request.if_none_match.contains_weak(etag):
+            response = make_response("", 304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag, weak=True)
+        if Config.CATALOG_CACHE_MAX_AGE > 0:
+            response.headers["Cache-Control"] = (
+                f"public, max-age={Config.CATALOG_CACHE_MAX_AGE}"
+            )
+        else:
+            response.headers["Cache-Control"] = "public, no-cache"
+        return response
+
+    return wrapper
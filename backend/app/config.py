@@ -1,6 +1,7 @@
 # Configuration file for TCGPlayer Card Scraper
 
 import os
+import tempfile
 
 
 class Config:
@@ -10,3 +11,44 @@ class Config:
 
     # Database Configuration
     DATABASE_PATH = os.environ.get("DATABASE_PATH") or "cards.db"
+
+    # Catalog version (bumped by the scraper); workers re-read it at most this often
+    CATALOG_VERSION_TTL = float(os.environ.get("CATALOG_VERSION_TTL", "5"))
+
+    # Cache-Control max-age (seconds) of catalog responses served with a
+    # catalog ETag; 0 makes clients revalidate every time
+    CATALOG_CACHE_MAX_AGE = int(os.environ.get("CATALOG_CACHE_MAX_AGE", "60"))
+
+    # Mixed into catalog ETags so a deploy that changes response formats
+    # invalidates cached bodies (Cloud Run sets K_REVISION)
+    API_REVISION = os.environ.get("API_REVISION") or os.environ.get("K_REVISION", "")
+
+    # Card search backend: "sql" (default) or "memory" (in-process index, see search_engine.py)
+    SEARCH_ENGINE = os.environ.get("SEARCH_ENGINE", "sql").lower()
+
+    # /api/cards response cache (entries per worker, seconds); size 0 disables it
+    SEARCH_CACHE_SIZE = int(os.environ.get("SEARCH_CACHE_SIZE", "512"))
+    SEARCH_CACHE_TTL = float(os.environ.get("SEARCH_CACHE_TTL", "300"))
+
+    # /api/ responses at least this many bytes are gzip/brotli compressed
+    COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", "1024"))
+    COMPRESS_LEVEL = int(os.environ.get("COMPRESS_LEVEL", "5"))
+
+    # TCGCSV scraper: groups fetched in parallel, and requests per second
+    # across all fetch threads (bursts of up to SCRAPER_RATE_BURST); a
+    # concurrency of 1 fetches groups one after another
+    SCRAPER_CONCURRENCY = int(os.environ.get("SCRAPER_CONCURRENCY", "4"))
+    SCRAPER_RATE_LIMIT = float(os.environ.get("SCRAPER_RATE_LIMIT", "10"))
+    SCRAPER_RATE_BURST = int(os.environ.get("SCRAPER_RATE_BURST", "5"))
+
+    # TCGCSV client (tcgcsv.py): on-disk cache of responses revalidated with
+    # ETag/Last-Modified ("" disables it), timeouts in seconds, and retries of
+    # failed requests with jittered exponential backoff
+    TCGCSV_CACHE_DIR = os.environ.get(
+        "TCGCSV_CACHE_DIR", os.path.join(tempfile.gettempdir(), "outdecked-tcgcsv")
+    )
+    TCGCSV_CONNECT_TIMEOUT = float(os.environ.get("TCGCSV_CONNECT_TIMEOUT", "5"))
+    TCGCSV_READ_TIMEOUT = float(os.environ.get("TCGCSV_READ_TIMEOUT", "30"))
+    TCGCSV_RETRIES = int(os.environ.get("TCGCSV_RETRIES", "3"))
+    TCGCSV_BACKOFF = float(os.environ.get("TCGCSV_BACKOFF", "0.5"))
+    TCGCSV_BACKOFF_MAX = float(os.environ.get("TCGCSV_BACKOFF_MAX", "10"))
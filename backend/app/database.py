@@ -5,8 +5,8 @@ Supports both SQLite (development) and PostgreSQL (production).
 """
 
 import os
-import requests
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, func, text
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
 from sqlalchemy.orm import sessionmaker, scoped_session
 from models import (
     Base,
@@ -18,8 +18,11 @@ from models import (
     Card,
     CardAttribute,
     CardPrice,
+    CardSearch,
+    CatalogState,
     Category,
     Group,
+    effective_price,
 )
 from datetime import datetime
 import json
@@ -40,6 +43,22 @@ class DatabaseManager:
 
         # Create session factory
         self.Session = scoped_session(sessionmaker(bind=self.engine))
+        self._track_compiled_cache()
+
+    def _track_compiled_cache(self):
+        """Count how often statements come out of SQLAlchemy's compiled cache."""
+        self.compiled_cache_stats = {"hits": 0, "misses": 0, "uncached": 0}
+
+        @event.listens_for(self.engine, "after_cursor_execute")
+        def _count_cache_use(conn, cursor, statement, parameters, context, executemany):
+            if context is None:
+                return
+            if context.cache_hit == CACHE_HIT:
+                self.compiled_cache_stats["hits"] += 1
+            elif context.cache_hit == CACHE_MISS:
+                self.compiled_cache_stats["misses"] += 1
+            else:
+                self.compiled_cache_stats["uncached"] += 1
 
     def _setup_postgresql(self):
         """Setup PostgreSQL connection for all environments."""
@@ -93,6 +112,11 @@ class DatabaseManager:
             # Create all tables (only creates if they don't exist)
             Base.metadata.create_all(self.engine)
 
+            # Bring existing tables up to date with the models
+            altered_tables = self.migrate_schema()
+            if self.engine.dialect.name == "postgresql":
+                self.create_postgresql_search_indexes()
+
             # Only print message if tables were actually created
             if not existing_tables:
                 print("Database tables created successfully")
@@ -104,6 +128,14 @@ class DatabaseManager:
             # Populate categories and groups
             self.populate_categories_and_groups()
 
+            # Backfill search rows for cards ingested before card_search existed,
+            # or recompute them all if card_search (or the prices it copies)
+            # just changed
+            self.sync_card_search(
+                rebuild=bool({"card_search", "card_prices"} & altered_tables)
+            )
+            self.ensure_catalog_state()
+
             # Create default accounts
             self.create_default_owner()
             self.create_test_user()
@@ -114,13 +146,16 @@ class DatabaseManager:
 
     def populate_categories_and_groups(self):
         """Populate categories and groups tables from TCGCSV."""
+        from tcgcsv import TCGCSVClient
+
+        client = TCGCSVClient()
         session = self.get_session()
+        added = 0
 
         try:
             # Fetch categories from TCGCSV
-            response = requests.get("https://tcgcsv.com/tcgplayer/categories")
-            if response.status_code == 200:
-                data = response.json()
+            data = client.get_json("https://tcgcsv.com/tcgplayer/categories")
+            if data:
                 categories = data.get("results", [])
 
                 new_categories = 0
@@ -142,15 +177,15 @@ class DatabaseManager:
                         new_categories += 1
 
                 session.commit()
+                added += new_categories
                 if new_categories > 0:
                     print(f"Populated {new_categories} new categories")
                 else:
                     print("Categories already up to date")
 
             # Fetch Union Arena groups
-            response = requests.get("https://tcgcsv.com/tcgplayer/81/groups")
-            if response.status_code == 200:
-                data = response.json()
+            data = client.get_json("https://tcgcsv.com/tcgplayer/81/groups")
+            if data:
                 groups = data.get("results", [])
 
                 new_groups = 0
@@ -175,16 +210,219 @@ class DatabaseManager:
                         new_groups += 1
 
                 session.commit()
+                added += new_groups
                 if new_groups > 0:
                     print(f"Populated {new_groups} new Union Arena groups")
                 else:
                     print("Union Arena groups already up to date")
 
+            if added:
+                # /api/games and card responses are cached per catalog version
+                from catalog import bump_catalog_version
+
+                bump_catalog_version()
+
         except Exception as e:
             print(f"Error populating categories and groups: {e}")
             session.rollback()
         finally:
             session.close()
+            print(client.summary())
+
+    def migrate_schema(self):
+        """Add model columns and indexes that existing tables are missing.
+
+        create_all() only creates missing tables, so columns added to a model
+        after its table exists are applied here with ALTER TABLE. On
+        PostgreSQL, text columns the model now declares Numeric (the
+        card_prices columns) are converted too; values that aren't numbers
+        become NULL. Before a new unique index is created, rows duplicating
+        its key are dropped, keeping the newest.
+
+        Returns:
+            set: Names of tables that had columns added or converted
+        """
+        from sqlalchemy import Numeric, String, inspect
+        from sqlalchemy.schema import CreateIndex
+
+        inspector = inspect(self.engine)
+        preparer = self.engine.dialect.identifier_preparer
+        altered_tables = set()
+
+        with self.engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                existing_columns = {
+                    column["name"]: column["type"]
+                    for column in inspector.get_columns(table.name)
+                }
+                for column in table.columns:
+                    column_type = column.type.compile(dialect=self.engine.dialect)
+                    existing_type = existing_columns.get(column.name)
+                    if existing_type is not None:
+                        if (
+                            self.engine.dialect.name == "postgresql"
+                            and isinstance(column.type, Numeric)
+                            and isinstance(existing_type, String)
+                        ):
+                            name = preparer.format_column(column)
+                            conn.execute(
+                                text(
+                                    f"ALTER TABLE {preparer.format_table(table)} "
+                                    f"ALTER COLUMN {name} TYPE {column_type} "
+                                    f"USING CASE WHEN TRIM({name}) ~ '^-?[0-9]+([.][0-9]+)?$' "
+                                    f"THEN TRIM({name})::numeric END"
+                                )
+                            )
+                            altered_tables.add(table.name)
+                            print(f"Converted column {table.name}.{column.name} to {column_type}")
+                        continue
+                    conn.execute(
+                        text(
+                            f"ALTER TABLE {preparer.format_table(table)} "
+                            f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+                        )
+                    )
+                    altered_tables.add(table.name)
+                    print(f"Added column {table.name}.{column.name}")
+
+                new_unique_indexes = [index for index in table.indexes if index.unique]
+                if new_unique_indexes:
+                    existing_indexes = {
+                        index["name"] for index in inspector.get_indexes(table.name)
+                    }
+                    new_unique_indexes = [
+                        index
+                        for index in new_unique_indexes
+                        if index.name not in existing_indexes
+                    ]
+                for index in new_unique_indexes:
+                    self._drop_duplicate_rows(conn, table, index)
+                for index in table.indexes:
+                    conn.execute(CreateIndex(index, if_not_exists=True))
+
+        return altered_tables
+
+    def _drop_duplicate_rows(self, conn, table, index):
+        """Keep only the newest row per key so a new unique index can be built."""
+        preparer = self.engine.dialect.identifier_preparer
+        table_name = preparer.format_table(table)
+        key = ", ".join(preparer.format_column(column) for column in index.columns)
+        result = conn.execute(
+            text(
+                f"DELETE FROM {table_name} WHERE id NOT IN "
+                f"(SELECT MAX(id) FROM {table_name} GROUP BY {key})"
+            )
+        )
+        if result.rowcount:
+            print(
+                f"Removed {result.rowcount} duplicate {table.name} rows "
+                f"before creating {index.name}"
+            )
+
+    def create_postgresql_search_indexes(self):
+        """Create the trigram and full-text indexes used by name/text search."""
+        statements = [
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            # Trigram GIN indexes let ILIKE '%term%' use an index scan
+            "CREATE INDEX IF NOT EXISTS ix_cards_name_trgm "
+            "ON cards USING gin (name gin_trgm_ops)",
+            "CREATE INDEX IF NOT EXISTS ix_cards_clean_name_trgm "
+            "ON cards USING gin (clean_name gin_trgm_ops)",
+            # Must match the expression used by the card text filter in search.py
+            "CREATE INDEX IF NOT EXISTS ix_card_search_fts "
+            "ON card_search USING gin "
+            "(to_tsvector('english', COALESCE(search_text, '')))",
+        ]
+        for statement in statements:
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(text(statement))
+            except Exception as e:
+                # Searches still work without these, just without index support
+                print(f"Could not create search index ({statement}): {e}")
+
+    def sync_card_search(self, rebuild=False):
+        """Create card_search rows for any cards that do not have one yet.
+
+        Args:
+            rebuild: Recompute the rows of every card, not just missing ones
+        """
+        session = self.get_session()
+
+        try:
+            if rebuild:
+                session.execute(text("DELETE FROM card_search"))
+            cards = session.execute(
+                text(
+                    "SELECT c.id, c.name, g.published_on FROM cards c "
+                    "LEFT JOIN groups g ON c.group_id = g.id "
+                    "LEFT JOIN card_search cs ON cs.card_id = c.id "
+                    "WHERE cs.card_id IS NULL"
+                )
+            ).fetchall()
+            if not cards:
+                session.commit()
+                return
+
+            # Load the attributes for all missing cards in one query
+            names_by_card = {card_id: name for card_id, name, _ in cards}
+            published_by_card = {card_id: published for card_id, _, published in cards}
+            attributes_by_card = {card_id: {} for card_id in names_by_card}
+            rows = (
+                session.query(
+                    CardAttribute.card_id, CardAttribute.name, CardAttribute.value
+                )
+                .filter(CardAttribute.card_id.in_(list(names_by_card)))
+                .all()
+            )
+            for card_id, name, value in rows:
+                attributes_by_card[card_id][name] = value
+
+            prices_by_card = {
+                card_id: effective_price(market_price, mid_price)
+                for card_id, market_price, mid_price in session.query(
+                    CardPrice.card_id,
+                    func.max(CardPrice.market_price),
+                    func.max(CardPrice.mid_price),
+                )
+                .filter(CardPrice.card_id.in_(list(names_by_card)))
+                .group_by(CardPrice.card_id)
+            }
+
+            session.bulk_insert_mappings(
+                CardSearch,
+                [
+                    CardSearch.values_from_attributes(
+                        card_id,
+                        attributes,
+                        name=names_by_card[card_id],
+                        published_on=published_by_card[card_id],
+                        price=prices_by_card.get(card_id),
+                    )
+                    for card_id, attributes in attributes_by_card.items()
+                ],
+            )
+            session.commit()
+            print(f"Backfilled {len(cards)} card search rows")
+        except Exception as e:
+            print(f"Error syncing card search rows: {e}")
+            session.rollback()
+        finally:
+            session.close()
+
+    def ensure_catalog_state(self):
+        """Create the catalog_state row that tracks the catalog version."""
+        session = self.get_session()
+
+        try:
+            if session.get(CatalogState, 1) is None:
+                session.add(CatalogState(id=1, version=1))
+                session.commit()
+        except Exception as e:
+            print(f"Error creating catalog state: {e}")
+            session.rollback()
+        finally:
+            session.close()
 
     def create_default_owner(self):
         """Create default owner account."""
@@ -298,6 +536,45 @@ def populate_categories_and_groups():
     db_manager.populate_categories_and_groups()
 
 
+def get_compiled_cache_stats():
+    """Get SQLAlchemy compiled statement cache counters for this worker."""
+    stats = dict(db_manager.compiled_cache_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+    return stats
+
+
+def get_search_statement_stats():
+    """Get per-statement call counts for card searches from pg_stat_statements.
+
+    Each distinct search shape should show up as one statement with a
+    growing call count. Returns None when not on PostgreSQL or when the
+    pg_stat_statements extension is not installed.
+    """
+    if db_manager.engine.dialect.name != "postgresql":
+        return None
+
+    session = db_manager.get_session()
+    try:
+        row = session.execute(
+            text(
+                "SELECT COUNT(*), COALESCE(SUM(calls), 0) FROM pg_stat_statements "
+                "WHERE query LIKE '%card_search%'"
+            )
+        ).fetchone()
+        return {"statements": row[0], "calls": int(row[1])}
+    except Exception:
+        session.rollback()
+        return None
+    finally:
+        session.close()
+
+
+def sync_card_search(rebuild=False):
+    """Backfill missing card_search rows (or recompute all of them)."""
+    db_manager.sync_card_search(rebuild=rebuild)
+
+
 def create_default_owner():
     """Legacy function for backward compatibility."""
     db_manager.create_default_owner()
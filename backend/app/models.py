@@ -14,11 +14,16 @@ from sqlalchemy import (
     ForeignKey,
     UniqueConstraint,
     Float,
+    Index,
+    Numeric,
+    func,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
 import json
+import re
 
 
 Base = declarative_base()
@@ -228,6 +233,12 @@ class Card(Base):
     prices = relationship(
         "CardPrice", back_populates="card", cascade="all, delete-orphan"
     )
+    search = relationship(
+        "CardSearch",
+        back_populates="card",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
 
     def to_dict(self):
         """Convert card to dictionary for JSON serialization."""
@@ -285,6 +296,193 @@ class CardAttribute(Base):
         }
 
 
+# Attributes copied out of card_attributes into typed card_search columns
+CARD_SEARCH_FIELDS = [
+    "rarity",
+    "series",
+    "card_type",
+    "activation_energy",
+    "required_energy",
+    "action_point_cost",
+    "battle_point",
+    "generated_energy",
+    "trigger_type",
+    "affinities",
+    "print_type",
+    "card_number",
+]
+
+# Numeric attributes and their integer card_search columns, which range
+# filters (e.g. bp>=3000) compare against
+NUMERIC_SEARCH_FIELDS = {
+    "required_energy": "required_energy_int",
+    "action_point_cost": "action_point_cost_int",
+    "battle_point": "battle_point_int",
+    "generated_energy": "generated_energy_int",
+}
+
+
+# Rarity sort rank, 1 = rarest; rarities not listed get a NULL rank
+RARITY_RANKS = {
+    "Secret Rare": 1,
+    "Ultra Rare": 2,
+    "Super Rare": 3,
+    "Rare": 4,
+    "Uncommon": 5,
+    "Common": 6,
+}
+
+
+def _parse_int(value):
+    """Parse an attribute value as an integer, or None if it isn't one."""
+    try:
+        return int(str(value).strip().replace(",", ""))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_price(value):
+    """Parse a TCGCSV price (number, numeric string or empty) as a Decimal, or None."""
+    if value is None or value == "":
+        return None
+    try:
+        price = Decimal(str(value).strip())
+    except InvalidOperation:
+        return None
+    return price if price.is_finite() else None
+
+
+def effective_price(market_price, mid_price):
+    """Price a card is shown and sorted by: its market price, else its mid price."""
+    price = parse_price(market_price)
+    return price if price is not None else parse_price(mid_price)
+
+
+def price_to_json(price):
+    """Numeric price as the float the API returns (None stays None)."""
+    return float(price) if price is not None else None
+
+
+def _trailing_int(value):
+    """Integer formed by the last run of digits (e.g. 'UE14BT/NIK-1-009' -> 9)."""
+    match = re.search(r"(\d+)\D*$", str(value)) if value else None
+    return int(match.group(1)) if match else None
+
+
+class CardSearch(Base):
+    """Denormalized search row per card, one column per known attribute.
+
+    card_attributes stays the storage of record; this table is maintained by
+    the scraper on ingest and is what the search path filters and sorts on.
+    """
+
+    __tablename__ = "card_search"
+
+    card_id = Column(
+        Integer, ForeignKey("cards.id", ondelete="CASCADE"), primary_key=True
+    )
+    rarity = Column(String)
+    series = Column(String)
+    card_type = Column(String)
+    activation_energy = Column(String)
+    required_energy = Column(String)
+    action_point_cost = Column(String)
+    battle_point = Column(String)
+    generated_energy = Column(String)
+    trigger_type = Column(String)
+    affinities = Column(String)
+    print_type = Column(String)
+    card_number = Column(String)
+    # Card name + card text, the document behind full-text search
+    search_text = Column(Text)
+
+    # Sort keys computed at ingest (see values_from_attributes)
+    published_on = Column(String)  # Copied from the card's group
+    rarity_rank = Column(Integer)
+    card_number_int = Column(Integer)
+    required_energy_int = Column(Integer)
+    # Typed numeric attributes (NUMERIC_SEARCH_FIELDS) for range filters
+    action_point_cost_int = Column(Integer)
+    battle_point_int = Column(Integer)
+    generated_energy_int = Column(Integer)
+    # Effective price (market, else mid) copied from card_prices, for price
+    # sorts and range filters (e.g. p<5)
+    price = Column(Numeric(10, 2))
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    card = relationship("Card", back_populates="search")
+
+    # Filters compare case-insensitively, so index the lowered values
+    __table_args__ = (
+        Index("ix_card_search_rarity", func.lower(rarity)),
+        Index("ix_card_search_series", func.lower(series)),
+        Index("ix_card_search_card_type", func.lower(card_type)),
+        Index("ix_card_search_activation_energy", func.lower(activation_energy)),
+        Index("ix_card_search_print_type", func.lower(print_type)),
+        Index("ix_card_search_trigger_type", func.lower(trigger_type)),
+        Index("ix_card_search_affinities", func.lower(affinities)),
+        # Range filters on numeric attributes (required_energy_int is
+        # covered by ix_card_search_recent_energy only behind published_on)
+        Index("ix_card_search_required_energy_int", required_energy_int),
+        Index("ix_card_search_action_point_cost_int", action_point_cost_int),
+        Index("ix_card_search_battle_point_int", battle_point_int),
+        Index("ix_card_search_generated_energy_int", generated_energy_int),
+        Index("ix_card_search_price", price),
+        # Composite sort indexes; the first one serves the default
+        # recent_series_rarity_desc sort as an ordered index scan
+        Index(
+            "ix_card_search_recent_rarity",
+            published_on.desc(),
+            rarity_rank,
+            card_id,
+        ),
+        Index(
+            "ix_card_search_recent_number",
+            published_on.desc(),
+            card_number_int,
+            card_id,
+        ),
+        Index(
+            "ix_card_search_recent_energy",
+            published_on.desc(),
+            required_energy_int,
+            card_id,
+        ),
+    )
+
+    @classmethod
+    def values_from_attributes(
+        cls, card_id, attributes, name=None, published_on=None, price=None
+    ):
+        """Build a card_search row (as a dict) from a name -> value mapping.
+
+        ``price`` is the card's effective price (see ``effective_price``).
+        """
+        values = {"card_id": card_id}
+        for field in CARD_SEARCH_FIELDS:
+            value = attributes.get(field)
+            values[field] = str(value) if value not in (None, "") else None
+        text_parts = [name, attributes.get("card_text")]
+        values["search_text"] = " ".join(str(p) for p in text_parts if p) or None
+
+        values["published_on"] = published_on
+        values["rarity_rank"] = RARITY_RANKS.get(values["rarity"])
+        values["card_number_int"] = _trailing_int(values["card_number"])
+        for field, column in NUMERIC_SEARCH_FIELDS.items():
+            values[column] = _parse_int(values[field])
+        values["price"] = price
+        return values
+
+    def to_dict(self):
+        """Convert card search row to dictionary for JSON serialization."""
+        data = {"card_id": self.card_id}
+        for field in CARD_SEARCH_FIELDS:
+            data[field] = getattr(self, field)
+        data["updated_at"] = self.updated_at.isoformat() if self.updated_at else None
+        return data
+
+
 class CardPrice(Base):
     """Card price data matching TCGCSV price structure."""
 
@@ -294,24 +492,29 @@ class CardPrice(Base):
     card_id = Column(
         Integer, ForeignKey("cards.id", ondelete="CASCADE"), nullable=False
     )
-    market_price = Column(String)  # Using String to match TCGCSV format
-    low_price = Column(String)
-    mid_price = Column(String)
-    high_price = Column(String)
+    # Stored as numbers (see parse_price); older databases are converted by
+    # DatabaseManager.migrate_schema
+    market_price = Column(Numeric(10, 2))
+    low_price = Column(Numeric(10, 2))
+    mid_price = Column(Numeric(10, 2))
+    high_price = Column(Numeric(10, 2))
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
     card = relationship("Card", back_populates="prices")
 
+    # One price row per card; the scraper upserts on it
+    __table_args__ = (Index("ux_card_prices_card_id", card_id, unique=True),)
+
     def to_dict(self):
         """Convert card price to dictionary for JSON serialization."""
         return {
             "id": self.id,
             "card_id": self.card_id,
-            "market_price": self.market_price,
-            "low_price": self.low_price,
-            "mid_price": self.mid_price,
-            "high_price": self.high_price,
+            "market_price": price_to_json(self.market_price),
+            "low_price": price_to_json(self.low_price),
+            "mid_price": price_to_json(self.mid_price),
+            "high_price": price_to_json(self.high_price),
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
 
@@ -353,6 +556,9 @@ class Group(Base):
     is_supplemental = Column(Boolean, default=False)
     published_on = Column(String)
     modified_on = Column(String)
+    # TCGCSV modifiedOn as of the last scrape that saved all of the group's
+    # cards; only TCGCSVScraper.mark_group_scraped writes it
+    scraped_modified_on = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     def to_dict(self):
@@ -370,6 +576,26 @@ class Group(Base):
         }
 
 
+class CatalogState(Base):
+    """Single-row catalog version, bumped whenever card data changes.
+
+    In-process indexes and caches compare against it to know when to rebuild.
+    """
+
+    __tablename__ = "catalog_state"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        """Convert catalog state to dictionary for JSON serialization."""
+        return {
+            "version": self.version,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
 # Deck management constants
 DECK_TEMPLATE = {
     "id": "",
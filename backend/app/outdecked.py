@@ -32,10 +32,20 @@ from database import (
     init_db,
     get_session,
 )
+from catalog import conditional_on_catalog
+import responses
 
 # from scraper import add_scraping_log  # Moved to scraping_archive
 from search import (
+    _parse_card_projection,
+    _project_cards,
+    build_card_attributes,
+    fetch_card_rows,
+    fetch_grid_cards,
     handle_api_search,
+    handle_api_search_batch,
+    handle_api_facets,
+    handle_conditional_values,
     handle_filter_fields,
     handle_filter_values,
 )
@@ -75,6 +85,9 @@ from deck_builder import (
 app = Flask(__name__, static_folder="frontend/out", static_url_path="/")
 app.config.from_object(Config)
 
+# orjson encoding and gzip/brotli compression for /api/ responses
+responses.init_app(app)
+
 # Configure sessions
 app.config["SESSION_COOKIE_SECURE"] = False  # Set to True in production with HTTPS
 app.config["SESSION_COOKIE_HTTPONLY"] = True
@@ -237,19 +250,57 @@ def search():
 
 # Public API - Card Search and Information
 @app.route("/api/cards", methods=["GET"])
+@conditional_on_catalog
 def api_cards():
     """Search cards with query syntax"""
     return handle_api_search()
 
 
+@app.route("/api/cards/search/batch", methods=["POST"])
+def api_cards_search_batch():
+    """Run several /api/cards searches (e.g. deckbuilder sections) in one request"""
+    return handle_api_search_batch()
+
+
+@app.route("/api/cards/facets", methods=["GET"])
+@conditional_on_catalog
+def api_cards_facets():
+    """Per-value counts for every filter field, for the same q/presets as /api/cards"""
+    return handle_api_facets()
+
+
+@app.route("/api/cards/suggest", methods=["GET"])
+@conditional_on_catalog
+def api_cards_suggest():
+    """Autocomplete card names, series and card numbers for the search box"""
+    from suggest import SUGGEST_TOP_N, suggest
+
+    prefix = request.args.get("prefix", "")
+    try:
+        limit = int(request.args.get("limit", SUGGEST_TOP_N))
+    except ValueError:
+        return jsonify({"error": "limit must be a number"}), 400
+
+    suggestions = suggest(prefix, limit) if prefix.strip() else []
+    return jsonify({"prefix": prefix, "suggestions": suggestions})
+
+
 @app.route("/api/cards/<int:card_id>")
+@conditional_on_catalog
 def get_card_by_id(card_id):
     """Get specific card by product_id with full attribute data"""
     db_session = get_session()
 
     try:
         # Use SQLAlchemy ORM to get card data
-        from models import Card, Group, CardAttribute, CardPrice
+        from models import (
+            Card,
+            Group,
+            CardAttribute,
+            CardPrice,
+            effective_price,
+            price_to_json,
+        )
 
         # Get the card with relationships
         card = db_session.query(Card).filter(Card.product_id == card_id).first()
@@ -299,7 +350,9 @@ def get_card_by_id(card_id):
 
         # Add price
         if price:
-            card_data["price"] = price.market_price or price.mid_price
+            card_data["price"] = price_to_json(
+                effective_price(price.market_price, price.mid_price)
+            )
         else:
             card_data["price"] = None
 
@@ -311,7 +364,7 @@ def get_card_by_id(card_id):
 
 @app.route("/api/cards/batch", methods=["POST"])
 def get_cards_batch():
-    """Get multiple cards by product IDs with full attribute data"""
+    """Get multiple cards by product IDs with full attribute data (or view/fields projection)"""
     try:
         data = request.get_json()
         product_ids = data.get("product_ids", [])
@@ -319,84 +372,54 @@ def get_cards_batch():
         if not product_ids:
             return jsonify([])
 
-        db_session = get_session()
-
-        # Create placeholders for the IN clause - use named parameters
-        placeholders = ",".join([f":product_id_{i}" for i in range(len(product_ids))])
-        params = {f"product_id_{i}": pid for i, pid in enumerate(product_ids)}
-
-        # Get cards with full attribute data (same structure as search endpoint)
-        query = (
-            f"SELECT c.*, g.name as group_name, g.abbreviation as group_abbreviation, "
-            f"STRING_AGG(cm.name || ':' || cm.value || ':' || cm.display_name, '|||') as metadata, "
-            f"COALESCE(MAX(cp.market_price), MAX(cp.mid_price)) as price "
-            f"FROM cards c "
-            f"LEFT JOIN groups g ON c.group_id = g.id "
-            f"LEFT JOIN card_attributes cm ON c.id = cm.card_id "
-            f"LEFT JOIN card_prices cp ON c.id = cp.card_id "
-            f"WHERE c.product_id IN ({placeholders}) "
-            f"GROUP BY c.id, g.name, g.abbreviation"
-        )
-
-        from sqlalchemy import text
+        try:
+            view, fields = _parse_card_projection(
+                data.get("view") or request.args.get("view"),
+                data.get("fields") or request.args.get("fields"),
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
-        result = db_session.execute(text(query), params)
-        rows = result.fetchall()
-        db_session.close()
+        db_session = get_session()
+        try:
+            if view == "grid":
+                return jsonify(
+                    _project_cards(
+                        fetch_grid_cards(db_session, "product_id", product_ids),
+                        fields,
+                    )
+                )
+
+            # Get cards with full attribute data (same structure as search endpoint)
+            rows = fetch_card_rows(db_session, "product_id", product_ids)
+        finally:
+            db_session.close()
 
-        # Convert to list of dictionaries and parse metadata
         cards = []
-        for row in rows:
-            card = dict(row._mapping)
-
-            # Parse metadata string into individual attributes
-            attributes = []
-            if card.get("metadata"):
-                metadata_pairs = card["metadata"].split("|||")
-                for pair in metadata_pairs:
-                    if ":" in pair:
-                        parts = pair.split(":", 2)  # Split into max 3 parts
-                        if len(parts) == 3:
-                            name, value, display_name = parts
-                        else:
-                            # Fallback for old format without display_name
-                            name, value = parts
-                            display_name = name
-
-                        card[name] = value
-                        # Also add to attributes array for frontend compatibility
-                        attributes.append(
-                            {
-                                "id": 0,  # Placeholder - not used by frontend
-                                "card_id": card["id"],
-                                "name": name,
-                                "value": value,
-                                "display_name": display_name,
-                                "created_at": card.get("created_at", ""),
-                            }
-                        )
-
-            # Add attributes array to card
-            card["attributes"] = attributes
-
-            # Remove the raw metadata string
-            if "metadata" in card:
-                del card["metadata"]
-
+        for card in rows:
+            attribute_rows = card.pop("attribute_rows")
+            for name, value, _ in attribute_rows:
+                card[name] = value
+            # Also add attributes array for frontend compatibility
+            card["attributes"] = build_card_attributes(
+                card["id"], attribute_rows, card.get("created_at", "")
+            )
             cards.append(card)
 
-        return jsonify(cards)
+        return jsonify(_project_cards(cards, fields))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @app.route("/api/cards/attributes")
+@conditional_on_catalog
 def api_cards_attributes():
     """List all available card attributes (renamed from /api/filter-fields)"""
     return handle_filter_fields()
 
 
 @app.route("/api/cards/attributes/<field>")
+@conditional_on_catalog
 def api_cards_attribute_values(field):
     """Get distinct values for specific attribute (renamed from /api/filter-values/<field>)"""
     game = request.args.get("game")
@@ -406,57 +429,26 @@ def api_cards_attribute_values(field):
 # Removed backward compatibility endpoints - use /api/cards/attributes and /api/cards/attributes/<field>
 
 
+@app.route("/api/cards/attributes/<field>/by/<given_field>")
+@conditional_on_catalog
+def api_cards_conditional_attribute_values(field, given_field):
+    """Get the values of one attribute per value of another (e.g. series -> rarity)"""
+    game = request.args.get("game", "Union Arena")
+    return handle_conditional_values(
+        field, given_field, request.args.get("value"), game
+    )
+
+
 @app.route("/api/cards/colors/<series>")
+@conditional_on_catalog
 def api_cards_colors_for_series(series):
     """Get available colors for a specific series"""
     game = request.args.get("game", "Union Arena")
-    db_session = get_session()
-
-    try:
-        # Use SQLAlchemy ORM to get distinct colors for the specified series
-        from models import Card, CardAttribute
-
-        # Get cards in the specified series
-        cards_in_series = (
-            db_session.query(Card)
-            .join(CardAttribute, Card.id == CardAttribute.card_id)
-            .filter(
-                Card.game == game,
-                CardAttribute.name == "series",
-                CardAttribute.value == series,
-            )
-            .all()
-        )
-
-        # Get distinct activation energy values for these cards
-        card_ids = [card.id for card in cards_in_series]
-
-        if not card_ids:
-            db_session.close()
-            return jsonify([])
-
-        colors = (
-            db_session.query(CardAttribute.value)
-            .filter(
-                CardAttribute.card_id.in_(card_ids),
-                CardAttribute.name == "activation_energy",
-            )
-            .distinct()
-            .order_by(CardAttribute.value)
-            .all()
-        )
-
-        color_list = [color[0] for color in colors]
-        db_session.close()
-
-        return jsonify(color_list)
-
-    except Exception as e:
-        db_session.close()
-        return jsonify({"error": str(e)}), 500
+    return handle_conditional_values("activation_energy", "series", series, game)
 
 
 @app.route("/api/games")
+@conditional_on_catalog
 def get_games():
     """Get available games"""
     db_session = get_session()
@@ -474,6 +466,7 @@ def get_games():
 
 
 @app.route("/api/analytics")
+@conditional_on_catalog
 def get_stats():
     """Get basic application statistics"""
     db_session = get_session()
@@ -534,6 +527,7 @@ def list_routes():
 
 
 @app.route("/api/analytics/games")
+@conditional_on_catalog
 def get_game_stats():
     """Get game-specific statistics (renamed from /api/game-stats)"""
     db_session = get_session()
@@ -724,6 +718,45 @@ def get_admin_scraping_status():
     return jsonify({"status": "idle", "message": "No scraping in progress"})
 
 
+@app.route("/api/admin/performance/stats", methods=["GET"])
+@require_permission("view_admin_panel")
+def get_admin_performance_stats():
+    """Search cache, in-memory index and SQL statement cache counters"""
+    from catalog import get_catalog_version
+    from database import get_compiled_cache_stats, get_search_statement_stats
+    from responses import get_response_stats
+    from search import (
+        count_cache,
+        facet_cache,
+        filter_value_cache,
+        get_statement_cache_stats,
+        search_cache,
+    )
+    from search_engine import get_engine_stats
+    from suggest import get_suggest_stats
+
+    return jsonify(
+        {
+            "catalog_version": get_catalog_version(),
+            "search_engine": Config.SEARCH_ENGINE,
+            "caches": [
+                search_cache.stats(),
+                count_cache.stats(),
+                facet_cache.stats(),
+                filter_value_cache.stats(),
+            ],
+            "index": get_engine_stats(),
+            "suggest": get_suggest_stats(),
+            "responses": get_response_stats(),
+            "statements": {
+                **get_statement_cache_stats(),
+                "compiled_cache": get_compiled_cache_stats(),
+                "postgres": get_search_statement_stats(),
+            },
+        }
+    )
+
+
 @app.route("/api/admin/database/backup", methods=["GET"])
 @require_permission("manage_database")
 def backup_admin_database():
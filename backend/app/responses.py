@@ -0,0 +1,170 @@
+"""
+JSON encoding and compression for API responses.
+
+- jsonify() encodes with orjson when it is installed, producing the same
+  JSON as Flask's encoder (sorted keys, same Decimal/date handling) several
+  times faster; without orjson Flask's encoder is used
+- /api/ responses of at least Config.COMPRESS_MIN_SIZE bytes are compressed
+  with brotli (when installed and accepted) or gzip, per Accept-Encoding
+- encode time and body sizes before/after compression are counted per route
+  for the admin performance stats endpoint
+"""
+
+import gzip
+import threading
+import time
+
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+
+from config import Config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Responses worth compressing (JSON, and the HTML/text some routes return)
+COMPRESSIBLE_MIMETYPES = ("application/json", "text/html", "text/plain")
+
+_lock = threading.Lock()
+_route_stats = {}
+
+
+def _route():
+    rule = request.url_rule
+    return rule.rule if rule is not None else request.path
+
+
+def _record(route, **counts):
+    with _lock:
+        stats = _route_stats.setdefault(
+            route,
+            {
+                "responses": 0,
+                "encoded": 0,
+                "encode_ms": 0.0,
+                "bytes": 0,
+                "compressed": 0,
+                "compressed_bytes": 0,
+            },
+        )
+        for key, value in counts.items():
+            stats[key] += value
+
+
+class ApiJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson and times jsonify().
+
+    Types orjson doesn't know (Decimal, dates, ...) go through Flask's own
+    ``default``, so responses don't change. Calls with extra json.dumps
+    arguments, debug mode (indented output) and installs without orjson use
+    Flask's encoder.
+    """
+
+    # Sorted keys like Flask's encoder; datetimes are passed to ``default``,
+    # which formats them as Flask does
+    options = (
+        orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if orjson is not None
+        else 0
+    )
+
+    def dumps(self, obj, **kwargs):
+        if kwargs or orjson is None:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self.options).decode()
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        started = time.perf_counter()
+        if orjson is None or self._app.debug:
+            response = super().response(obj)
+        else:
+            body = orjson.dumps(obj, default=self.default, option=self.options)
+            response = self._app.response_class(body, mimetype=self.mimetype)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        _record(_route(), encoded=1, encode_ms=elapsed_ms)
+        return response
+
+
+def _choose_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def compress_response(response):
+    """after_request hook: compress large /api/ bodies and count their sizes."""
+    if not request.path.startswith("/api/"):
+        return response
+    if response.status_code == 304:
+        # A 304 carries the Vary of the 200 it revalidates, so shared caches
+        # keep compressed and uncompressed bodies apart
+        response.vary.add("Accept-Encoding")
+        return response
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code == 204
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    body = response.get_data()
+    route = _route()
+    encoding = _choose_encoding() if len(body) >= Config.COMPRESS_MIN_SIZE else None
+    response.vary.add("Accept-Encoding")
+    if encoding is None:
+        _record(route, responses=1, bytes=len(body), compressed_bytes=len(body))
+        return response
+
+    if encoding == "br":
+        compressed = brotli.compress(body, quality=Config.COMPRESS_LEVEL)
+    else:
+        compressed = gzip.compress(body, compresslevel=Config.COMPRESS_LEVEL)
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    _record(
+        route,
+        responses=1,
+        compressed=1,
+        bytes=len(body),
+        compressed_bytes=len(compressed),
+    )
+    return response
+
+
+def init_app(app):
+    """Install the JSON provider and the compression hook on an app."""
+    app.json = ApiJSONProvider(app)
+    app.after_request(compress_response)
+
+
+def get_response_stats():
+    """Get per-route encode time and compression counters for this worker."""
+    with _lock:
+        routes = {route: dict(stats) for route, stats in _route_stats.items()}
+
+    for stats in routes.values():
+        stats["encode_ms"] = round(stats["encode_ms"], 2)
+        stats["avg_encode_ms"] = (
+            round(stats["encode_ms"] / stats["encoded"], 3) if stats["encoded"] else None
+        )
+        stats["bytes_saved"] = stats["bytes"] - stats["compressed_bytes"]
+    return {
+        "encoder": "orjson" if orjson is not None else "json",
+        "compression": ["br", "gzip"] if brotli is not None else ["gzip"],
+        "min_size": Config.COMPRESS_MIN_SIZE,
+        "routes": routes,
+    }
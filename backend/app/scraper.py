@@ -4,19 +4,291 @@ TCGCSV-Only Scraper for Union Arena Cards
 No TCGPlayer scraping needed - all data comes from TCGCSV!
 """
 
-import requests
+import threading
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 # Load environment variables from .env file BEFORE importing database
 load_dotenv()
 
+from catalog import bump_catalog_version
+from config import Config
 from database import get_session
-from models import Card, CardAttribute, CardPrice, Group, Category
-from sqlalchemy import text
+from tcgcsv import TCGCSVClient
+from models import (
+    Card,
+    CardAttribute,
+    CardPrice,
+    CardSearch,
+    Group,
+    effective_price,
+    parse_price,
+)
+from sqlalchemy import bindparam, func, insert, select, text, update
 from datetime import datetime
 
+# card_data keys that are card columns or prices rather than attributes
+CARD_DATA_FIELDS = {
+    "name",
+    "clean_name",
+    "card_url",
+    "game",
+    "product_id",
+    "group_id",
+    "category_id",
+    "image_count",
+    "is_presale",
+    "released_on",
+    "presale_note",
+    "modified_on",
+    "price",
+    "low_price",
+    "mid_price",
+    "high_price",
+    "published_on",
+}
+
+PRICE_COLUMNS = ["market_price", "low_price", "mid_price", "high_price"]
+
+
+def _upsert(conn, model, rows, conflict_columns, set_, returning=None):
+    """Multi-row INSERT ... ON CONFLICT DO UPDATE (PostgreSQL and SQLite).
+
+    Args:
+        set_: Function taking the statement's ``excluded`` columns and
+            returning the column -> value mapping applied on conflict
+        returning: Columns to return for every inserted or updated row
+    """
+    if conn.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+    stmt = dialect_insert(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=conflict_columns, set_=set_(stmt.excluded)
+    )
+    if returning is None:
+        conn.execute(stmt, rows)
+        return []
+    return conn.execute(stmt.returning(*returning), rows).fetchall()
+
+
+def _upsert_prices(conn, price_rows):
+    """Upsert card_prices rows; prices left as None keep their stored value.
+
+    Returns:
+        dict: card_id -> effective price after the upsert
+    """
+    price_table = CardPrice.__table__
+    return {
+        card_id: effective_price(market_price, mid_price)
+        for card_id, market_price, mid_price in _upsert(
+            conn,
+            CardPrice,
+            price_rows,
+            ["card_id"],
+            lambda excluded: {
+                column: func.coalesce(excluded[column], price_table.c[column])
+                for column in PRICE_COLUMNS
+            },
+            returning=[CardPrice.card_id, CardPrice.market_price, CardPrice.mid_price],
+        )
+    }
+
+
+def save_prices_bulk(prices_by_product):
+    """Update the prices of saved cards from TCGCSV price entries.
+
+    Used for cards whose product data hasn't changed: only cards whose
+    prices differ from the stored ones are written, together with their
+    card_search price. Products without a saved card are ignored.
+
+    Args:
+        prices_by_product: product_id -> TCGCSV price entry
+
+    Returns:
+        int: Number of cards whose prices changed
+    """
+    from database import db_manager
+
+    if not prices_by_product:
+        return 0
+
+    now = datetime.utcnow()
+    with db_manager.engine.begin() as conn:
+        stored = conn.execute(
+            select(
+                Card.id,
+                Card.product_id,
+                *(getattr(CardPrice, column) for column in PRICE_COLUMNS),
+            )
+            .outerjoin(CardPrice, CardPrice.card_id == Card.id)
+            .where(Card.product_id.in_(list(prices_by_product)))
+        ).fetchall()
+
+        price_rows = []
+        for card_id, product_id, *current in stored:
+            price_data = prices_by_product[product_id]
+            prices = {
+                "market_price": parse_price(price_data.get("marketPrice")),
+                "low_price": parse_price(price_data.get("lowPrice")),
+                "mid_price": parse_price(price_data.get("midPrice")),
+                "high_price": parse_price(price_data.get("highPrice")),
+            }
+            # Missing prices keep their stored value, as in save_cards_bulk
+            merged = [
+                new if new is not None else old
+                for new, old in zip(prices.values(), current)
+            ]
+            if merged != current:
+                price_rows.append({"card_id": card_id, "created_at": now, **prices})
+
+        if not price_rows:
+            return 0
+        card_prices = _upsert_prices(conn, price_rows)
+        conn.execute(
+            update(CardSearch)
+            .where(CardSearch.card_id == bindparam("search_card_id"))
+            .values(price=bindparam("search_price"), updated_at=now),
+            [
+                {"search_card_id": card_id, "search_price": price}
+                for card_id, price in card_prices.items()
+            ],
+        )
+    return len(price_rows)
+
+
+def save_cards_bulk(cards_data):
+    """Save a group's cards with multi-row upserts in one transaction.
+
+    Does what save_card_to_db_sqlalchemy does for one card: cards are
+    upserted on product_id, prices on card_id (prices the feed leaves out
+    keep their stored value), attributes are replaced and card_search rows
+    are upserted.
+
+    Returns:
+        int: Rows written (cards, prices, attributes and search rows)
+    """
+    from database import db_manager
+
+    # A product listed twice keeps its last listing (a row can only be
+    # upserted once per statement)
+    cards_by_product = {card_data["product_id"]: card_data for card_data in cards_data}
+    if not cards_by_product:
+        return 0
+
+    now = datetime.utcnow()
+    card_rows = [
+        {
+            "name": card_data["name"],
+            "clean_name": card_data.get("clean_name", ""),
+            "card_url": card_data.get("card_url", ""),
+            "game": card_data.get("game", "Union Arena"),
+            "product_id": product_id,
+            "group_id": card_data.get("group_id"),
+            "category_id": card_data.get("category_id", 81),
+            "image_count": card_data.get("image_count", 0),
+            "is_presale": card_data.get("is_presale", False),
+            "released_on": card_data.get("released_on", ""),
+            "presale_note": card_data.get("presale_note", ""),
+            "modified_on": card_data.get("modified_on", ""),
+            "created_at": now,
+        }
+        for product_id, card_data in cards_by_product.items()
+    ]
+    card_columns = [
+        column for column in card_rows[0] if column not in ("product_id", "created_at")
+    ]
+
+    with db_manager.engine.begin() as conn:
+        card_ids = {
+            product_id: card_id
+            for card_id, product_id in _upsert(
+                conn,
+                Card,
+                card_rows,
+                ["product_id"],
+                lambda excluded: {column: excluded[column] for column in card_columns},
+                returning=[Card.id, Card.product_id],
+            )
+        }
+
+        price_rows = []
+        attributes_by_card = {}
+        for product_id, card_data in cards_by_product.items():
+            card_id = card_ids[product_id]
+            prices = {
+                "market_price": parse_price(card_data.get("price")),
+                "low_price": parse_price(card_data.get("low_price")),
+                "mid_price": parse_price(card_data.get("mid_price")),
+                "high_price": parse_price(card_data.get("high_price")),
+            }
+            if any(value is not None for value in prices.values()):
+                price_rows.append({"card_id": card_id, "created_at": now, **prices})
+            attributes_by_card[card_id] = {
+                name: value
+                for name, value in card_data.items()
+                if name not in CARD_DATA_FIELDS and value
+            }
+
+        # Effective prices of the upserted rows, stored values included
+        card_prices = _upsert_prices(conn, price_rows) if price_rows else {}
+
+        conn.execute(
+            CardAttribute.__table__.delete().where(
+                CardAttribute.card_id.in_(list(attributes_by_card))
+            )
+        )
+        attribute_rows = [
+            {
+                "card_id": card_id,
+                "name": name,
+                "value": str(value),
+                "display_name": name.replace("_", " ").title(),
+                "created_at": now,
+            }
+            for card_id, attributes in attributes_by_card.items()
+            for name, value in attributes.items()
+        ]
+        if attribute_rows:
+            conn.execute(insert(CardAttribute), attribute_rows)
+
+        search_rows = [
+            {
+                **CardSearch.values_from_attributes(
+                    card_ids[product_id],
+                    attributes_by_card[card_ids[product_id]],
+                    name=card_data["name"],
+                    published_on=card_data.get("published_on"),
+                    price=card_prices.get(card_ids[product_id]),
+                ),
+                "updated_at": now,
+            }
+            for product_id, card_data in cards_by_product.items()
+        ]
+        search_table = CardSearch.__table__
+        _upsert(
+            conn,
+            CardSearch,
+            search_rows,
+            ["card_id"],
+            lambda excluded: {
+                # Cards without a price in the feed keep the stored one
+                column: (
+                    func.coalesce(excluded[column], search_table.c[column])
+                    if column == "price"
+                    else excluded[column]
+                )
+                for column in search_rows[0]
+                if column != "card_id"
+            },
+        )
+
+    return len(card_rows) + len(price_rows) + len(attribute_rows) + len(search_rows)
+
 
 def save_card_to_db_sqlalchemy(card_data):
     """Save a single card to database using SQLAlchemy ORM"""
@@ -65,35 +337,27 @@ def save_card_to_db_sqlalchemy(card_data):
         db_session.flush()  # Get the card ID
 
         # Handle price data
-        if (
-            card_data.get("price")
-            or card_data.get("low_price")
-            or card_data.get("mid_price")
-            or card_data.get("high_price")
-        ):
-            existing_price = (
-                db_session.query(CardPrice).filter(CardPrice.card_id == card.id).first()
-            )
-
-            if existing_price:
-                # Update existing price
-                if card_data.get("price"):
-                    existing_price.market_price = card_data["price"]
-                if card_data.get("low_price"):
-                    existing_price.low_price = card_data["low_price"]
-                if card_data.get("mid_price"):
-                    existing_price.mid_price = card_data["mid_price"]
-                if card_data.get("high_price"):
-                    existing_price.high_price = card_data["high_price"]
+        prices = {
+            "market_price": parse_price(card_data.get("price")),
+            "low_price": parse_price(card_data.get("low_price")),
+            "mid_price": parse_price(card_data.get("mid_price")),
+            "high_price": parse_price(card_data.get("high_price")),
+        }
+        price = (
+            db_session.query(CardPrice).filter(CardPrice.card_id == card.id).first()
+        )
+        if any(value is not None for value in prices.values()):
+            if price:
+                # Update existing price, keeping values the feed left out
+                for column, value in prices.items():
+                    if value is not None:
+                        setattr(price, column, value)
             else:
                 # Create new price
                 price = CardPrice(
                     card_id=card.id,
-                    market_price=card_data.get("price"),
-                    low_price=card_data.get("low_price"),
-                    mid_price=card_data.get("mid_price"),
-                    high_price=card_data.get("high_price"),
                     created_at=datetime.utcnow(),
+                    **prices,
                 )
                 db_session.add(price)
 
@@ -104,26 +368,10 @@ def save_card_to_db_sqlalchemy(card_data):
         ).delete()
 
         # Add new attributes
+        saved_attributes = {}
         for attr_name, attr_value in card_data.items():
             # Skip non-attribute fields
-            if attr_name in [
-                "name",
-                "clean_name",
-                "card_url",
-                "game",
-                "product_id",
-                "group_id",
-                "category_id",
-                "image_count",
-                "is_presale",
-                "released_on",
-                "presale_note",
-                "modified_on",
-                "price",
-                "low_price",
-                "mid_price",
-                "high_price",
-            ]:
+            if attr_name in CARD_DATA_FIELDS:
                 continue
 
             if attr_value:  # Only save non-empty attributes
@@ -135,6 +383,28 @@ def save_card_to_db_sqlalchemy(card_data):
                     created_at=datetime.utcnow(),
                 )
                 db_session.add(attribute)
+                saved_attributes[attr_name] = attr_value
+
+        # Keep the denormalized search row in step with the attributes
+        published_on = card_data.get("published_on")
+        if published_on is None and card.group_id:
+            group = db_session.get(Group, card.group_id)
+            published_on = group.published_on if group else None
+        db_session.merge(
+            CardSearch(
+                **CardSearch.values_from_attributes(
+                    card.id,
+                    saved_attributes,
+                    name=card.name,
+                    published_on=published_on,
+                    price=(
+                        effective_price(price.market_price, price.mid_price)
+                        if price
+                        else None
+                    ),
+                )
+            )
+        )
 
         db_session.commit()
         return 1  # Success
@@ -186,51 +456,231 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class TokenBucket:
+    """Thread-safe token bucket rate limiter.
+
+    Allows ``rate`` acquisitions per second on average, with bursts of up to
+    ``capacity``; a rate of 0 or less disables limiting. ``clock`` and
+    ``sleep`` can be replaced for tests.
+    """
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self.updated = clock()
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, sleeping until one is available.
+
+        Returns:
+            float: Seconds waited
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            # Reserve the token now; a negative balance is the wait for it
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.waited += wait
+        if wait:
+            self._sleep(wait)
+        return wait
+
+
 class TCGCSVScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
+    def __init__(self, concurrency=None, rate_limit=None, full=False):
+        """
+        Args:
+            concurrency: Groups fetched in parallel (default
+                Config.SCRAPER_CONCURRENCY); 1 fetches them one by one
+            rate_limit: TCGCSV requests per second across all threads
+                (default Config.SCRAPER_RATE_LIMIT)
+            full: Fetch and rewrite every group and card; by default only
+                groups and cards whose TCGCSV modifiedOn changed are, and
+                the rest only get their prices updated
+        """
+        self.full = full
+        self.concurrency = max(
+            1, Config.SCRAPER_CONCURRENCY if concurrency is None else concurrency
+        )
+        self.rate_limiter = TokenBucket(
+            Config.SCRAPER_RATE_LIMIT if rate_limit is None else rate_limit,
+            Config.SCRAPER_RATE_BURST,
+        )
+        # One pooled connection per fetch thread
+        self.client = TCGCSVClient(
+            pool_size=max(10, self.concurrency), rate_limiter=self.rate_limiter
         )
+        # TCGCSV group_id -> groups row, loaded once per run (see load_groups)
+        self.groups = None
+        # Totals for the run's summary
+        self.groups_processed = 0
+        self.groups_skipped = 0
+        self.cards_processed = 0
+        self.cards_skipped = 0
+        self.prices_updated = 0
+        # Set when card data is saved; the catalog version is bumped once,
+        # by publish_changes, rather than after every group
+        self.catalog_changed = False
+        self.rows_written = 0
+        self.write_seconds = 0.0
 
     def get_union_arena_groups(self):
         """Get all Union Arena groups from TCGCSV"""
         url = "https://tcgcsv.com/tcgplayer/81/groups"
-        response = self.session.get(url)
-        if response.status_code == 200:
-            data = response.json()
+        data = self.client.get_json(url)
+        if data:
             return data.get("results", [])
         return []
 
     def get_group_products(self, group_id):
         """Get all products from a group"""
         url = f"https://tcgcsv.com/tcgplayer/81/{group_id}/products"
-        response = self.session.get(url)
-        if response.status_code == 200:
-            data = response.json()
+        data = self.client.get_json(url)
+        if data:
             return data.get("results", [])
         return []
 
     def get_group_prices(self, group_id):
         """Get prices for all products in a group"""
         url = f"https://tcgcsv.com/tcgplayer/81/{group_id}/prices"
-        response = self.session.get(url)
-        if response.status_code == 200:
-            data = response.json()
+        data = self.client.get_json(url)
+        if data:
             return data.get("results", [])
         return []
 
+    def load_groups(self):
+        """Load the groups table into a TCGCSV group_id -> group info map."""
+        db_session = get_session()
+        try:
+            card_counts = dict(
+                db_session.execute(
+                    text("SELECT group_id, COUNT(*) FROM cards GROUP BY group_id")
+                ).fetchall()
+            )
+            self.groups = {
+                group.group_id: {
+                    "id": group.id,
+                    "abbreviation": group.abbreviation,
+                    "published_on": group.published_on,
+                    "scraped_modified_on": group.scraped_modified_on,
+                    "card_count": card_counts.get(group.id, 0),
+                }
+                for group in db_session.query(Group).all()
+            }
+        finally:
+            db_session.close()
+        return self.groups
+
+    def group_changed(self, group):
+        """Check whether a TCGCSV group needs scraping in incremental mode.
+
+        A group is unchanged when its cards were saved before and its
+        modifiedOn matches the one stored when they were.
+        """
+        stored = self.groups.get(group["groupId"])
+        return (
+            stored is None
+            or not stored["card_count"]
+            or stored["scraped_modified_on"] != group.get("modifiedOn")
+        )
+
+    def mark_group_scraped(self, group_id, modified_on):
+        """Store the modifiedOn a group's cards were last saved at."""
+        db_session = get_session()
+        try:
+            db_session.query(Group).filter(Group.group_id == group_id).update(
+                {
+                    Group.modified_on: modified_on,
+                    Group.scraped_modified_on: modified_on,
+                }
+            )
+            db_session.commit()
+        finally:
+            db_session.close()
+        if self.groups and group_id in self.groups:
+            self.groups[group_id]["scraped_modified_on"] = modified_on
+
+    def changed_products(self, products):
+        """Drop products whose modifiedOn matches their saved card's."""
+        db_session = get_session()
+        try:
+            stored = dict(
+                db_session.query(Card.product_id, Card.modified_on)
+                .filter(Card.product_id.in_([p["productId"] for p in products]))
+                .all()
+            )
+        finally:
+            db_session.close()
+        return [
+            product
+            for product in products
+            if stored.get(product["productId"]) != product.get("modifiedOn", "")
+        ]
+
     def is_individual_card(self, product):
         """Check if a product is an individual card using extendedData"""
         return len(product.get("extendedData", [])) > 0
 
+    def fetch_group(self, group_id, prices_only=False):
+        """Fetch a group's products (None if prices_only) and prices from TCGCSV."""
+        products = None if prices_only else self.get_group_products(group_id)
+        return products, self.get_group_prices(group_id)
+
+    def _fetch_groups(self, groups, prices_only=()):
+        """Yield (group, products, prices) for each group as its fetch finishes.
+
+        Groups whose groupId is in ``prices_only`` only have their prices
+        fetched (products is None). With a concurrency above 1, groups are
+        fetched by a thread pool so the caller can save one group while later
+        ones are still downloading.
+        """
+        if self.concurrency == 1:
+            for group in groups:
+                yield group, *self.fetch_group(
+                    group["groupId"], prices_only=group["groupId"] in prices_only
+                )
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="tcgcsv"
+        ) as pool:
+            futures = {
+                pool.submit(
+                    self.fetch_group,
+                    group["groupId"],
+                    prices_only=group["groupId"] in prices_only,
+                ): group
+                for group in groups
+            }
+            for future in as_completed(futures):
+                yield futures[future], *future.result()
+
     def scrape_group_cards(self, group_id, group_name):
         """Scrape all individual cards from a group using TCGCSV data only"""
-        products = self.get_group_products(group_id)
-        prices = self.get_group_prices(group_id)
-
+        products, prices = self.fetch_group(group_id)
+        try:
+            return self.save_group_cards(group_id, group_name, products, prices)
+        finally:
+            self.publish_changes()
+
+    def save_group_cards(self, group_id, group_name, products, prices, modified_on=None):
+        """Build and save a group's individual cards from its TCGCSV data
+
+        Args:
+            modified_on: The group's TCGCSV modifiedOn, stored once all of
+                its cards are saved so incremental runs can skip it
+        """
         if not products:
             return []
 
@@ -246,7 +696,42 @@ class TCGCSVScraper:
 
         logger.info(f"Found {len(individual_cards)} individual cards in {group_name}")
 
+        prices_updated = 0
+        if not self.full:
+            changed_cards = self.changed_products(individual_cards)
+            if len(changed_cards) < len(individual_cards):
+                changed_ids = {product["productId"] for product in changed_cards}
+                unchanged_ids = [
+                    product["productId"]
+                    for product in individual_cards
+                    if product["productId"] not in changed_ids
+                ]
+                self.cards_skipped += len(unchanged_ids)
+                # Prices move without modifiedOn changing, so keep them current
+                prices_updated = self.save_prices(
+                    group_name,
+                    {
+                        product_id: price_lookup[product_id]
+                        for product_id in unchanged_ids
+                        if product_id in price_lookup
+                    },
+                )
+                logger.info(
+                    f"Skipping {len(unchanged_ids)} unchanged cards in {group_name}"
+                )
+            individual_cards = changed_cards
+
+        # Group abbreviation for print type detection and internal group ID
+        from search import detect_print_type
+
+        groups = self.groups if self.groups is not None else self.load_groups()
+        group = groups.get(group_id, {})
+        group_abbreviation = group.get("abbreviation")
+        internal_group_id = group.get("id")  # Use internal ID for card storage
+        group_published_on = group.get("published_on")
+
         scraped_cards = []
+        cards_saved = 0
 
         for i, product in enumerate(individual_cards):
             product_id = product["productId"]
@@ -319,30 +804,7 @@ class TCGCSVScraper:
             # Get presale info
             presale_info = product.get("presaleInfo", {})
 
-            # Get group abbreviation for print type detection and internal group ID
-            group_abbreviation = None
-            internal_group_id = None
-            if group_id:
-                from database import get_session
-                from models import Group
-
-                db_session = get_session()
-                try:
-                    # Query by group_id (TCGCSV ID) not internal id
-                    group = (
-                        db_session.query(Group)
-                        .filter(Group.group_id == group_id)
-                        .first()
-                    )
-                    if group:
-                        group_abbreviation = group.abbreviation
-                        internal_group_id = group.id  # Use internal ID for card storage
-                finally:
-                    db_session.close()
-
             # Detect print type using group abbreviation
-            from search import detect_print_type
-
             print_type = detect_print_type(group_abbreviation, product_name)
 
             # Build card data with TCGCSV structure
@@ -365,26 +827,85 @@ class TCGCSVScraper:
                 "low_price": price_data.get("lowPrice", ""),
                 "mid_price": price_data.get("midPrice", ""),
                 "high_price": price_data.get("highPrice", ""),
+                "published_on": group_published_on,  # Search sort key, not an attribute
                 **attributes,  # Add all TCGCSV attributes
                 # Add standardized snake_case attribute names
                 "rarity": attributes.get("rarity", ""),  # Keep as snake_case
                 "print_type": print_type,  # Add print type detection as snake_case
             }
 
-            # Save card to database immediately using SQLAlchemy
-            try:
-                saved_count = save_card_to_db_sqlalchemy(card_data)
-                if saved_count > 0:
-                    logger.info(f"SAVED: {product_name}")
-                else:
-                    logger.warning(f"FAILED: {product_name}")
-            except Exception as e:
-                logger.error(f"ERROR saving card {product_name}: {e}")
-
             scraped_cards.append(card_data)
 
+        # Write the whole group in one transaction
+        started = time.perf_counter()
+        try:
+            rows_written = save_cards_bulk(scraped_cards) if scraped_cards else 0
+            cards_saved = len(scraped_cards)
+            elapsed = time.perf_counter() - started
+            self.rows_written += rows_written
+            self.write_seconds += elapsed
+            logger.info(
+                f"SAVED {cards_saved} cards from {group_name}: {rows_written} rows "
+                f"in {elapsed:.2f}s ({rows_written / max(elapsed, 1e-6):.0f} rows/s)"
+            )
+        except Exception as e:
+            # Fall back to card-by-card saves so one bad card doesn't lose the group
+            logger.error(f"ERROR bulk saving group {group_name}, saving cards one by one: {e}")
+            for card_data in scraped_cards:
+                try:
+                    if save_card_to_db_sqlalchemy(card_data) > 0:
+                        cards_saved += 1
+                        logger.info(f"SAVED: {card_data['name']}")
+                    else:
+                        logger.warning(f"FAILED: {card_data['name']}")
+                except Exception as e:
+                    logger.error(f"ERROR saving card {card_data['name']}: {e}")
+
+        self.cards_processed += len(scraped_cards)
+        if cards_saved:
+            self.catalog_changed = True
+        if modified_on and cards_saved == len(scraped_cards):
+            self.mark_group_scraped(group_id, modified_on)
+
         return scraped_cards
 
+    def save_prices(self, group_name, prices_by_product):
+        """Update saved cards' prices from a group's TCGCSV price entries.
+
+        Returns:
+            int: Number of cards whose prices changed
+        """
+        try:
+            updated = save_prices_bulk(prices_by_product)
+        except Exception as e:
+            logger.error(f"ERROR updating prices for group {group_name}: {e}")
+            return 0
+        self.prices_updated += updated
+        if updated:
+            # Price sorts, filters and card responses changed
+            self.catalog_changed = True
+            logger.info(f"Updated prices of {updated} cards in {group_name}")
+        return updated
+
+    def save_group_prices(self, group_name, prices):
+        """Update the prices of an unchanged group's saved cards."""
+        return self.save_prices(
+            group_name, {price["productId"]: price for price in prices}
+        )
+
+    def publish_changes(self):
+        """Bump the catalog version if card data was saved since the last bump.
+
+        Every bump makes running workers drop their caches and rebuild their
+        in-memory search data, so a scrape bumps once, when it's done.
+        """
+        if not self.catalog_changed:
+            return None
+        version = bump_catalog_version()
+        self.catalog_changed = False
+        logger.info(f"Catalog version is now {version}")
+        return version
+
     def scrape_all_union_arena_cards(self):
         """Scrape all Union Arena cards from all groups using TCGCSV only"""
         logger.info("Starting Union Arena card scraping using TCGCSV only...")
@@ -392,30 +913,105 @@ class TCGCSVScraper:
         groups = self.get_union_arena_groups()
         if not groups:
             logger.error("No Union Arena groups found")
+            logger.info(self.client.summary())
             return
 
         logger.info(f"Found {len(groups)} Union Arena groups")
 
-        total_cards = 0
-        all_cards = []
-        for group in groups:
-            group_id = group["groupId"]
-            group_name = group["name"]
-
-            logger.info(f"Processing group: {group_name} (ID: {group_id})")
+        self.load_groups()
+        if any(group["groupId"] not in self.groups for group in groups):
+            # New sets: add them to the groups table, then reload the map
+            from database import populate_categories_and_groups
 
-            group_cards = self.scrape_group_cards(group_id, group_name)
-            total_cards += len(group_cards)
-            all_cards.extend(group_cards)
+            populate_categories_and_groups()
+            self.load_groups()
 
+        # Unchanged groups only have their prices fetched and updated
+        unchanged_groups = set()
+        if not self.full:
+            unchanged_groups = {
+                group["groupId"] for group in groups if not self.group_changed(group)
+            }
+            self.groups_skipped = len(unchanged_groups)
             logger.info(
-                f"Completed group {group_name}: {len(group_cards)} cards processed"
+                f"Incremental scrape: {len(groups) - len(unchanged_groups)} changed "
+                f"groups, {len(unchanged_groups)} unchanged groups (prices only)"
             )
 
+        total_cards = 0
+        all_cards = []
+        save_seconds = 0.0
+        started = time.perf_counter()
+        try:
+            # Groups are saved on this thread while the pool fetches the rest
+            for group, products, prices in self._fetch_groups(groups, unchanged_groups):
+                group_id = group["groupId"]
+                group_name = group["name"]
+
+                save_started = time.perf_counter()
+                if products is None:
+                    self.save_group_prices(group_name, prices)
+                    save_seconds += time.perf_counter() - save_started
+                    continue
+
+                logger.info(f"Processing group: {group_name} (ID: {group_id})")
+                group_cards = self.save_group_cards(
+                    group_id, group_name, products, prices, modified_on=group.get("modifiedOn")
+                )
+                self.groups_processed += 1
+                save_seconds += time.perf_counter() - save_started
+                total_cards += len(group_cards)
+                all_cards.extend(group_cards)
+
+                logger.info(
+                    f"Completed group {group_name}: {len(group_cards)} cards processed"
+                )
+        finally:
+            # Publish what was saved, even if a fetch failed part way
+            self.publish_changes()
+
+        elapsed = time.perf_counter() - started
         logger.info(f"Scraping completed! Total cards processed: {total_cards}")
+        logger.info(
+            f"{'Full' if self.full else 'Incremental'} scrape: processed "
+            f"{self.groups_processed} groups ({self.cards_processed} cards), skipped "
+            f"{self.groups_skipped} unchanged groups and {self.cards_skipped} unchanged "
+            f"cards, updated prices of {self.prices_updated} unchanged cards"
+        )
+        # The serial path spends all of its fetch and save time back to back
+        # (time spent waiting for the rate limiter isn't counted as fetching)
+        fetch_seconds = self.client.stats["request_seconds"]
+        serial_seconds = fetch_seconds + save_seconds
+        logger.info(
+            f"Scraped {len(groups)} groups in {elapsed:.2f}s with "
+            f"{self.concurrency} fetch threads ({fetch_seconds:.2f}s fetching, "
+            f"{save_seconds:.2f}s saving, {self.rate_limiter.waited:.2f}s rate limited); "
+            f"serial estimate {serial_seconds:.2f}s, "
+            f"{serial_seconds / max(elapsed, 1e-6):.1f}x speedup"
+        )
+        if self.write_seconds:
+            logger.info(
+                f"Wrote {self.rows_written} rows in {self.write_seconds:.2f}s "
+                f"({self.rows_written / self.write_seconds:.0f} rows/s)"
+            )
+        logger.info(self.client.summary())
         return all_cards
 
 
 if __name__ == "__main__":
-    scraper = TCGCSVScraper()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scrape Union Arena cards from TCGCSV")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-fetch and rewrite every group, not just groups and cards that changed "
+        "(unchanged ones still get their prices updated)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, help="Groups fetched in parallel (1 = serial)"
+    )
+    args = parser.parse_args()
+
+    scraper = TCGCSVScraper(concurrency=args.concurrency, full=args.full)
     scraper.scrape_all_union_arena_cards()
@@ -2,9 +2,36 @@
 Search API handlers for the Flask backend
 """
 
+import base64
+import functools
+import json
+import re
+from decimal import Decimal
 from flask import request, jsonify
+from cache import LRUCache
+from catalog import get_catalog_version
+from config import Config
 from database import get_session
-from sqlalchemy import text
+from models import CARD_SEARCH_FIELDS, NUMERIC_SEARCH_FIELDS, price_to_json
+from sqlalchemy import text, bindparam
+
+# Cards and their search row; every search filters and sorts on this
+SEARCH_FROM = (
+    "FROM cards c "
+    "JOIN card_search cs ON cs.card_id = c.id "
+    "LEFT JOIN groups g ON c.group_id = g.id"
+)
+
+# Numeric comparison token, e.g. bp>=3000, en<2 or p<4.50
+RANGE_TOKEN = re.compile(r"^([A-Za-z_]+)(>=|<=|>|<|=)(-?\d+(?:\.\d+)?)$")
+RANGE_OPERATORS = (">=", "<=", ">", "<", "=")
+
+# card_search columns numeric comparisons run against: the integer
+# attribute columns, plus the card's effective price
+RANGE_FILTER_COLUMNS = {**NUMERIC_SEARCH_FIELDS, "price": "price"}
+
+# Range values must fit a 64-bit integer, the widest integer drivers bind
+RANGE_VALUE_LIMIT = 2**63 - 1
 
 
 def parse_query_syntax(query_string):
@@ -16,12 +43,17 @@ def parse_query_syntax(query_string):
     - Space between fields = AND
     - Minus prefix = NOT
     - No colon = name search
+    - t:value = full-text search over card name and card text
     - Underscores replace spaces in values
+    - field>=N, field<=N, field>N, field<N, field=N = numeric comparison
+      (numeric attributes and price only, e.g. bp>=3000 en<=2 p<4.50)
 
     Returns: {
         'search_query': 'name search terms',
         'filters': [{'type': 'and/or/not', 'field': 'field_name', 'value': 'value'}, ...]
     }
+
+    Numeric comparisons add an 'op' key to their filter.
     """
     filters = []
     search_terms = []
@@ -39,6 +71,8 @@ def parse_query_syntax(query_string):
         "af": "affinities",
         "tr": "trigger_type",
         "ge": "generated_energy",
+        "t": "card_text",
+        "p": "price",
     }
 
     # Split by spaces
@@ -50,7 +84,24 @@ def parse_query_syntax(query_string):
         if is_not:
             token = token[1:]
 
-        if ":" in token:
+        range_match = RANGE_TOKEN.match(token)
+        if range_match and (
+            range_match.group(1) in field_map
+            or range_match.group(1) in RANGE_FILTER_COLUMNS
+        ):
+            # field>=N pattern on a shortcut or numeric field; other words
+            # with an operator in them are name search terms
+            field_short, op, number = range_match.groups()
+            field = field_map.get(field_short, field_short)
+            filters.append(
+                {
+                    "type": "not" if is_not else "and",
+                    "field": field,
+                    "value": number,
+                    "op": op,
+                }
+            )
+        elif ":" in token:
             # field:value pattern
             field_short, values_str = token.split(":", 1)
             field = field_map.get(field_short, field_short)
@@ -102,18 +153,18 @@ def detect_print_type(abbreviation, card_name=None):
         return "Base"
 
 
-def _parse_search_params(request):
-    """Parse search parameters from request.
+def _parse_search_params(args):
+    """Parse search parameters from request args (or a batch search spec).
 
     Returns:
-        dict: Contains page, per_page, sort_by, search_query, query_filters, query_fields
+        dict: Contains page, per_page, cursor, count_mode, sort_by,
+            search_query, query_filters, query_fields
     """
-    page = int(request.args.get("page", 1))
-    per_page = int(request.args.get("per_page", 24))
-    sort_by = request.args.get("sort", "recent_series_rarity_desc")
+    page = int(args.get("page", 1))
+    per_page = int(args.get("per_page", 24))
 
     # Parse query syntax from 'q' parameter
-    query_string = request.args.get("q", "")
+    query_string = args.get("q", "")
     if query_string:
         parsed = parse_query_syntax(query_string)
         search_query = parsed["search_query"]
@@ -122,12 +173,18 @@ def _parse_search_params(request):
         search_query = ""
         query_filters = []
 
+    # Name searches rank best matches first unless a sort is requested
+    default_sort = "relevance" if search_query else "recent_series_rarity_desc"
+    sort_by = args.get("sort", default_sort)
+
     # Detect which fields are specified in query (for smart preset handling)
     query_fields = {f["field"] for f in query_filters}
 
     return {
         "page": page,
         "per_page": per_page,
+        "cursor": args.get("cursor") or None,
+        "count_mode": args.get("count", "exact"),
         "sort_by": sort_by,
         "search_query": search_query,
         "query_filters": query_filters,
@@ -135,11 +192,11 @@ def _parse_search_params(request):
     }
 
 
-def _apply_preset_filters(request, query_fields):
+def _apply_preset_filters(args, query_fields):
     """Apply preset filters based on request parameters.
 
     Args:
-        request: Flask request object
+        args: Request args (or a batch search spec)
         query_fields: Set of fields already in query filters
 
     Returns:
@@ -148,7 +205,7 @@ def _apply_preset_filters(request, query_fields):
     filters = []
 
     # Apply presets ONLY if query doesn't override them
-    if "basic_prints" in request.args and "print_type" not in query_fields:
+    if "basic_prints" in args and "print_type" not in query_fields:
         filters.extend(
             [
                 {"type": "or", "field": "print_type", "value": "Base"},
@@ -156,208 +213,445 @@ def _apply_preset_filters(request, query_fields):
             ]
         )
 
-    if "base_rarity" in request.args and "rarity" not in query_fields:
+    if "base_rarity" in args and "rarity" not in query_fields:
         rarities = ["Common", "Uncommon", "Rare", "Super Rare"]
 
         # Include Action Point rarity if no_ap not present AND card_type not overridden
-        if "no_ap" not in request.args and "card_type" not in query_fields:
+        if "no_ap" not in args and "card_type" not in query_fields:
             rarities.append("Action Point")
 
         for rarity in rarities:
             filters.append({"type": "or", "field": "rarity", "value": rarity})
 
-    if "no_ap" in request.args and "card_type" not in query_fields:
+    if "no_ap" in args and "card_type" not in query_fields:
         filters.append({"type": "not", "field": "card_type", "value": "Action Point"})
 
     return filters
 
 
-def _build_where_conditions(filters, search_query):
-    """Build WHERE clause and parameters from filters.
+def _dialect_name(db_session):
+    """Name of the SQL dialect behind a session ('postgresql', 'sqlite', ...)."""
+    return db_session.get_bind().dialect.name
+
+
+def _text_search_condition(param_name, dialect):
+    """Full-text condition over card name + card text (``t:`` filters)."""
+    if dialect == "postgresql":
+        # Expression matches the ix_card_search_fts GIN index
+        return (
+            "to_tsvector('english', COALESCE(cs.search_text, '')) "
+            f"@@ plainto_tsquery('english', :{param_name})"
+        )
+    return f"LOWER(COALESCE(cs.search_text, '')) LIKE :{param_name}"
+
+
+# Card columns that filters may compare directly; any other non-attribute
+# field is rejected instead of being interpolated into the SQL
+DIRECT_FILTER_FIELDS = (
+    "game",
+    "product_id",
+    "name",
+    "clean_name",
+    "group_id",
+    "group_name",
+    "category_id",
+    "released_on",
+)
+
+FILTER_TYPES = ("and", "or", "not")
+
+
+def _filter_shape(filters):
+    """Split filters into their shape and their values.
+
+    The shape - a sorted tuple of (type, field, op) triples, where op is ""
+    for equality filters and a RANGE_OPERATORS entry for numeric
+    comparisons - is all the generated SQL depends on; values are only ever
+    bound as parameters. Sorting makes filters given in any order share one
+    statement.
+
+    Returns:
+        tuple: (shape, values) with values aligned to the shape
+
+    Raises:
+        ValueError: If a filter names an unknown field, or compares a
+            non-numeric field or value
+    """
+    items = []
+    for filter_item in filters:
+        filter_type = filter_item.get("type", "and")
+        field = filter_item.get("field", "")
+        value = filter_item.get("value", "")
+        op = filter_item.get("op") or ""
+
+        if not field or not value or filter_type not in FILTER_TYPES:
+            continue
+
+        column = normalize_field_name(field)
+        if op:
+            if op not in RANGE_OPERATORS or column not in RANGE_FILTER_COLUMNS:
+                raise ValueError(
+                    "Numeric comparisons are only supported on: "
+                    + ", ".join(RANGE_FILTER_COLUMNS)
+                )
+            try:
+                # Attribute columns hold whole numbers; prices have cents and
+                # are bound as exact decimal strings, which every driver takes
+                number = Decimal(value) if column == "price" else int(value)
+                in_range = -RANGE_VALUE_LIMIT <= number <= RANGE_VALUE_LIMIT
+            except (TypeError, ValueError, ArithmeticError):
+                raise ValueError(f"Not a number: {value}")
+            if not in_range:
+                raise ValueError(f"Number out of range: {value}")
+            value = str(number) if column == "price" else number
+        elif column in CARD_SEARCH_FIELDS:
+            # Compared against the lowered column index
+            value = value.lower()
+        elif field != "card_text" and field not in DIRECT_FILTER_FIELDS:
+            raise ValueError(f"Unknown filter field: {field}")
+
+        items.append(((filter_type, field, op), value))
+
+    # Values of one (type, field, op) are all ints or all strings
+    items.sort()
+    return tuple(key for key, _ in items), [value for _, value in items]
+
+
+@functools.lru_cache(maxsize=256)
+def _where_clause_for_shape(shape, has_search, dialect):
+    """Build the WHERE clause for a filter shape.
+
+    Filter ``i`` of the shape binds parameter ``:f{i}``, so the SQL text
+    never depends on filter values and SQLAlchemy's compiled cache can
+    reuse it.
 
     Args:
-        filters: List of filter dictionaries
-        search_query: Search query string for name matching
+        shape: Shape from ``_filter_shape``
+        has_search: Whether there are name search terms
+        dialect: SQL dialect name; non-PostgreSQL databases get portable
+            LIKE-based fallbacks for name and text search
 
     Returns:
-        tuple: (where_clause string, params dictionary)
+        str: WHERE clause, or an empty string
     """
     where_conditions = []
-    params = {}
 
     # Handle search query (case-insensitive)
-    if search_query:
-        where_conditions.append(
-            "(c.name ILIKE :search1 OR c.clean_name ILIKE :search2)"
-        )
-        search_param = f"%{search_query}%"
-        params["search1"] = search_param
-        params["search2"] = search_param
+    if has_search:
+        if dialect == "postgresql":
+            # Served by the pg_trgm GIN indexes on name and clean_name
+            where_conditions.append(
+                "(c.name ILIKE :search1 OR c.clean_name ILIKE :search2)"
+            )
+        else:
+            where_conditions.append(
+                "(LOWER(c.name) LIKE :search1 OR LOWER(c.clean_name) LIKE :search2)"
+            )
 
     # Process unified filters - group OR filters by field
     and_conditions = []
     or_conditions_by_field = {}  # Group OR conditions by field
     not_conditions = []
 
-    for filter_item in filters:
-        filter_type = filter_item.get("type", "and")
-        field = filter_item.get("field", "")
-        value = filter_item.get("value", "")
-
-        if not field or not value:
-            continue
+    for i, (filter_type, field, op) in enumerate(shape):
+        param_name = f"f{i}"
+        column = normalize_field_name(field)
+        is_attribute = column in CARD_SEARCH_FIELDS
 
         # Build condition based on field type
-        if field == "game":
-            condition = "c.game = :game"
-            params["game"] = value
-        elif field in [
-            "series",
-            "rarity",
-            "card_type",
-            "print_type",
-            "activation_energy",
-            "required_energy",
-            "action_point_cost",
-            "trigger_type",
-            "affinities",
-        ]:
-            # Generate unique parameter names for each field value
-            existing_params = [
-                p for p in params.keys() if p.startswith(f"{field.lower()}_")
-            ]
-            param_name = f"{field.lower()}_{len(existing_params)}"
-            # Use ILIKE for case-insensitive matching
-            condition = f"EXISTS (SELECT 1 FROM card_attributes WHERE card_id = c.id AND name = :{param_name}_field AND value ILIKE :{param_name}_value)"
-            params[f"{param_name}_field"] = normalize_field_name(field)
-            params[f"{param_name}_value"] = value
+        if op:
+            # Range scan on the typed numeric column
+            column = RANGE_FILTER_COLUMNS[column]
+            condition = f"cs.{column} {op} :{param_name}"
+        elif field == "card_text":
+            condition = _text_search_condition(param_name, dialect)
+        elif is_attribute:
+            # Case-insensitive equality against the lowered column index
+            condition = f"LOWER(cs.{column}) = :{param_name}"
         else:
-            # Handle other fields
-            param_name = f"{field.lower()}_direct"
+            # Direct card column from DIRECT_FILTER_FIELDS
             condition = f"c.{field} = :{param_name}"
-            params[param_name] = value
 
         # Group conditions by type
         if filter_type == "and":
             and_conditions.append(condition)
         elif filter_type == "or":
             # Group OR conditions by field
-            if field not in or_conditions_by_field:
-                or_conditions_by_field[field] = []
-            or_conditions_by_field[field].append(condition)
-        elif filter_type == "not":
-            # Handle NULL values properly for NOT filters
-            if field in [
-                "series",
-                "activation_energy",
-                "card_type",
-                "rarity",
-                "print_type",
-                "trigger_type",
-                "affinities",
-            ]:
-                # For card_attributes fields, exclude only if attribute exists AND equals value
-                not_param_field = f"not_{field.lower()}_field"
-                not_param_value = f"not_{field.lower()}_value"
-                # Use ILIKE for case-insensitive matching
-                not_condition = f"NOT EXISTS (SELECT 1 FROM card_attributes WHERE card_id = c.id AND name = :{not_param_field} AND value ILIKE :{not_param_value})"
-                not_conditions.append(not_condition)
-                params[not_param_field] = normalize_field_name(field)
-                params[not_param_value] = value
-            else:
-                # For direct card fields, use standard NOT logic
-                not_conditions.append(f"NOT ({condition})")
+            or_conditions_by_field.setdefault(field, []).append(condition)
+        elif op:
+            # Exclude only if the value exists AND matches the comparison
+            not_conditions.append(f"(cs.{column} IS NULL OR NOT ({condition}))")
+        elif is_attribute:
+            # Exclude only if attribute exists AND equals value
+            not_conditions.append(
+                f"(cs.{column} IS NULL OR LOWER(cs.{column}) <> :{param_name})"
+            )
+        else:
+            # For direct card fields, use standard NOT logic
+            not_conditions.append(f"NOT ({condition})")
 
     # Combine all conditions
-    if and_conditions:
-        where_conditions.extend(and_conditions)
+    where_conditions.extend(and_conditions)
 
     # Add grouped OR conditions (each field group becomes its own OR condition)
-    for field, conditions in or_conditions_by_field.items():
+    for conditions in or_conditions_by_field.values():
         if len(conditions) > 1:
-            or_condition = f"({' OR '.join(conditions)})"
-            where_conditions.append(or_condition)
+            where_conditions.append(f"({' OR '.join(conditions)})")
         else:
             where_conditions.extend(conditions)
 
-    if not_conditions:
-        where_conditions.extend(not_conditions)
+    where_conditions.extend(not_conditions)
 
-    where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
+    return "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
 
-    return where_clause, params
 
+def _where_params(shape, values, search_query, dialect):
+    """Bind filter values and name search terms for ``_where_clause_for_shape``."""
+    params = {}
 
-def _build_sort_clause(sort_by):
-    """Build ORDER BY clause from sort parameter.
+    if search_query:
+        if dialect == "postgresql":
+            search_param = f"%{search_query}%"
+        else:
+            search_param = f"%{search_query.lower()}%"
+        params["search1"] = search_param
+        params["search2"] = search_param
+        # Used by the relevance sort to rank exact and prefix matches first
+        params["search_exact"] = search_query.lower()
+        params["search_prefix"] = f"{search_query.lower()}%"
+        params["search_word"] = f"% {search_query.lower()}%"
+
+    for i, ((_, field, _), value) in enumerate(zip(shape, values)):
+        if field == "card_text" and dialect != "postgresql":
+            value = f"%{value.lower()}%"
+        params[f"f{i}"] = value
+
+    return params
+
+
+def _build_where_conditions(filters, search_query, dialect="postgresql"):
+    """Build WHERE clause and parameters from filters.
+
+    Attribute filters are answered from the denormalized card_search table
+    (aliased ``cs``), so every condition is a plain column comparison.
 
     Args:
-        sort_by: Sort parameter string
+        filters: List of filter dictionaries
+        search_query: Search query string for name matching
+        dialect: SQL dialect name
 
     Returns:
-        str: ORDER BY SQL clause
+        tuple: (where_clause string, params dictionary)
+
+    Raises:
+        ValueError: If a filter names an unknown field
     """
-    if not sort_by:
-        return "ORDER BY c.name"
+    shape, values = _filter_shape(filters)
+    where_clause = _where_clause_for_shape(shape, bool(search_query), dialect)
+    return where_clause, _where_params(shape, values, search_query, dialect)
+
+
+def _sort_keys(sort_by, search_query=""):
+    """Get the ordered sort keys for a sort parameter.
 
-    if sort_by == "price_desc":
-        return "ORDER BY COALESCE(cp.market_price, cp.mid_price) DESC"
+    Rarity, card number and required energy sort on integer keys that the
+    scraper precomputes into card_search (see ``CardSearch``), and the
+    recent-series sorts line up with its composite published_on indexes.
+    Every sort ends with ``cs.card_id`` so that the order is total, which
+    keyset (cursor) pagination relies on.
+
+    Args:
+        sort_by: Sort parameter string
+        search_query: Name search terms; required by the relevance sort
+
+    Returns:
+        list: (sql_expression, "ASC"/"DESC", nulls_last) tuples
+    """
+    if sort_by == "relevance" and not search_query:
+        sort_by = "recent_series_rarity_desc"
+
+    if sort_by == "relevance":
+        # Exact name, then name prefix, then word prefix, then any substring.
+        # Only rows matched by the name filter are ranked, and with LIMIT the
+        # database keeps a bounded top-N heap rather than sorting them all.
+        keys = [
+            (
+                """CASE
+            WHEN LOWER(c.name) = :search_exact THEN 0
+            WHEN LOWER(c.name) LIKE :search_prefix THEN 1
+            WHEN LOWER(c.name) LIKE :search_word THEN 2
+            ELSE 3
+        END""",
+                "ASC",
+            ),
+            ("LENGTH(c.name)", "ASC"),
+            ("c.name", "ASC"),
+        ]
+    elif sort_by == "price_desc":
+        # Effective price precomputed into card_search; ix_card_search_price
+        keys = [("cs.price", "DESC")]
     elif sort_by == "price_asc":
-        return "ORDER BY COALESCE(cp.market_price, cp.mid_price) ASC"
+        keys = [("cs.price", "ASC")]
     elif sort_by == "rarity_desc":
-        return """ORDER BY CASE 
-            WHEN (SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'rarity') = 'Common' THEN 1
-            WHEN (SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'rarity') = 'Uncommon' THEN 2
-            WHEN (SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'rarity') = 'Rare' THEN 3
-            WHEN (SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'rarity') = 'Super Rare' THEN 4
-            WHEN (SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'rarity') = 'Ultra Rare' THEN 5
-            WHEN (SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'rarity') = 'Secret Rare' THEN 6
-            ELSE 7
-        END DESC"""
+        # rarity_rank is 1 for the rarest; unranked rarities come first
+        keys = [("cs.rarity_rank", "ASC", False)]
     elif sort_by == "rarity_asc":
-        return """ORDER BY CASE 
-            WHEN (SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'rarity') = 'Common' THEN 1
-            WHEN (SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'rarity') = 'Uncommon' THEN 2
-            WHEN (SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'rarity') = 'Rare' THEN 3
-            WHEN (SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'rarity') = 'Super Rare' THEN 4
-            WHEN (SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'rarity') = 'Ultra Rare' THEN 5
-            WHEN (SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'rarity') = 'Secret Rare' THEN 6
-            ELSE 7
-        END ASC"""
-    elif sort_by == "name_asc":
-        return "ORDER BY c.name ASC"
+        keys = [("cs.rarity_rank", "DESC", True)]
     elif sort_by == "name_desc":
-        return "ORDER BY c.name DESC"
+        keys = [("c.name", "DESC")]
     elif sort_by == "number_desc":
-        return "ORDER BY CAST(SUBSTR((SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'card_number'), -3) AS INTEGER) DESC"
+        keys = [("cs.card_number_int", "DESC")]
     elif sort_by == "number_asc":
-        return "ORDER BY CAST(SUBSTR((SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'card_number'), -3) AS INTEGER) ASC"
+        keys = [("cs.card_number_int", "ASC")]
     elif sort_by == "required_energy_desc":
-        return "ORDER BY CAST((SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'required_energy') AS INTEGER) DESC"
+        keys = [("cs.required_energy_int", "DESC")]
     elif sort_by == "required_energy_asc":
-        return "ORDER BY CAST((SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'required_energy') AS INTEGER) ASC"
+        keys = [("cs.required_energy_int", "ASC")]
     elif sort_by == "recent_series_rarity_desc":
-        # Sort by most recent series first (published_on DESC), then by rarity DESC
-        return """ORDER BY g.published_on DESC, 
-            CASE 
-                WHEN (SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'rarity') = 'Secret Rare' THEN 1
-                WHEN (SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'rarity') = 'Ultra Rare' THEN 2
-                WHEN (SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'rarity') = 'Super Rare' THEN 3
-                WHEN (SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'rarity') = 'Rare' THEN 4
-                WHEN (SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'rarity') = 'Uncommon' THEN 5
-                WHEN (SELECT value FROM card_attributes WHERE card_id = c.id AND name = 'rarity') = 'Common' THEN 6
-                ELSE 7
-            END ASC"""
-
-    # Default fallback
-    return "ORDER BY c.name"
+        # Most recent series first, then rarest first, unranked last;
+        # matches ix_card_search_recent_rarity
+        keys = [("cs.published_on", "DESC"), ("cs.rarity_rank", "ASC")]
+    else:
+        # name_asc and default fallback
+        keys = [("c.name", "ASC")]
+
+    keys.append(("cs.card_id", "ASC"))
+    # Default NULL placement is PostgreSQL's: last when ASC, first when DESC
+    return [
+        key if len(key) == 3 else (key[0], key[1], key[1] == "ASC") for key in keys
+    ]
+
+
+def _build_sort_clause(sort_by, search_query=""):
+    """Build ORDER BY clause from sort parameter.
+
+    Args:
+        sort_by: Sort parameter string
+        search_query: Name search terms; required by the relevance sort
+
+    Returns:
+        str: ORDER BY SQL clause
+    """
+    terms = []
+    for expression, direction, nulls_last in _sort_keys(sort_by, search_query):
+        # Spell out NULL placement so every dialect orders the same way
+        nulls = "NULLS LAST" if nulls_last else "NULLS FIRST"
+        terms.append(f"{expression} {direction} {nulls}")
+    return "ORDER BY " + ", ".join(terms)
+
+
+def _keyset_condition_for_shape(sort_keys, null_keys):
+    """Build a WHERE condition selecting rows strictly after a cursor position.
+
+    Expands the tuple comparison into OR-ed prefixes so that mixed ASC/DESC
+    keys and NULL sort values (ordered as in ``_build_sort_clause``) work.
+    The text only depends on which cursor values are NULL; the values bind
+    as ``:cursor_{i}``.
+
+    Args:
+        sort_keys: Keys from ``_sort_keys``
+        null_keys: For each key, whether the cursor's value is NULL
+
+    Returns:
+        str: Condition SQL
+    """
+    equal_prefix = []
+    alternatives = []
+
+    for i, (key, is_null) in enumerate(zip(sort_keys, null_keys)):
+        expression, direction, nulls_last = key
+        param_name = f"cursor_{i}"
+        if is_null:
+            # NULLs sort last (nothing after them) or first (non-NULLs follow)
+            after = None if nulls_last else f"{expression} IS NOT NULL"
+            equal = f"{expression} IS NULL"
+        else:
+            operator = ">" if direction == "ASC" else "<"
+            after = f"{expression} {operator} :{param_name}"
+            if nulls_last:
+                after = f"({after} OR {expression} IS NULL)"
+            equal = f"{expression} = :{param_name}"
+
+        if after:
+            alternatives.append("(" + " AND ".join(equal_prefix + [after]) + ")")
+        equal_prefix.append(equal)
+
+    return "(" + " OR ".join(alternatives) + ")" if alternatives else "1 = 0"
+
+
+def _build_keyset_condition(sort_keys, values):
+    """Build the keyset condition and its parameters for a cursor.
+
+    Args:
+        sort_keys: Keys from ``_sort_keys``
+        values: The last row's value for each key
+
+    Returns:
+        tuple: (condition string, params dictionary)
+    """
+    condition = _keyset_condition_for_shape(
+        sort_keys, tuple(value is None for value in values)
+    )
+    params = {
+        f"cursor_{i}": value for i, value in enumerate(values) if value is not None
+    }
+    return condition, params
+
+
+def _encode_cursor(sort_by, values):
+    """Encode the last row's sort key values as an opaque cursor string."""
+    values = [str(v) if isinstance(v, Decimal) else v for v in values]
+    payload = json.dumps({"s": sort_by, "k": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor, sort_by, key_count):
+    """Decode a cursor from ``_encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        values = payload["k"]
+        issued_sort = payload["s"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if issued_sort != sort_by or not isinstance(values, list) or len(values) != key_count:
+        raise ValueError("Cursor does not match the requested sort")
+    return values
+
+
+def build_card_attributes(card_id, attribute_rows, created_at=""):
+    """Build the attribute list the frontend expects from attribute rows.
+
+    Args:
+        card_id: Internal card id
+        attribute_rows: (name, value, display_name) tuples
+        created_at: Card creation timestamp copied onto each attribute
+
+    Returns:
+        list: Attribute dictionaries
+    """
+    return [
+        {
+            "id": 0,  # Placeholder - not used by frontend
+            "card_id": card_id,
+            "name": name,
+            "value": value,
+            "display_name": display_name or name,
+            "created_at": created_at,
+        }
+        for name, value, display_name in attribute_rows
+    ]
 
 
 def _process_card_results(raw_cards):
     """Process raw card database results into API format.
 
     Args:
-        raw_cards: List of raw card dictionaries from database
+        raw_cards: Card dictionaries from ``fetch_card_rows``
 
     Returns:
         list: Processed card dictionaries with attributes
@@ -388,122 +682,886 @@ def _process_card_results(raw_cards):
             "created_at": card.get("created_at", ""),
         }
 
-        # Parse metadata string and add as attributes array
-        attributes = []
-        if card["metadata"]:
-            metadata_pairs = card["metadata"].split("|||")
-            for pair in metadata_pairs:
-                if ":" in pair:
-                    parts = pair.split(":", 2)  # Split into max 3 parts
-                    if len(parts) == 3:
-                        name, field_value, display_name = parts
-                    else:
-                        # Fallback for old format without display_name
-                        name, field_value = parts
-                        display_name = name
-
-                    # Don't overwrite group fields with any field from metadata
-                    if name not in ["group_name", "group_abbreviation"]:
-                        processed_card[name] = field_value
-                        # Also add to attributes array for frontend compatibility
-                        attributes.append(
-                            {
-                                "id": 0,  # Placeholder - not used by frontend
-                                "card_id": card["id"],
-                                "name": name,
-                                "value": field_value,
-                                "display_name": display_name,
-                                "created_at": card.get("created_at", ""),
-                            }
-                        )
-
-        # Add attributes array to processed card
-        processed_card["attributes"] = attributes
+        # Don't overwrite group fields with any attribute
+        attribute_rows = [
+            row
+            for row in card["attribute_rows"]
+            if row[0] not in ("group_name", "group_abbreviation")
+        ]
+        for name, value, _ in attribute_rows:
+            processed_card[name] = value
+        # Also add as attributes array for frontend compatibility
+        processed_card["attributes"] = build_card_attributes(
+            card["id"], attribute_rows, card.get("created_at", "")
+        )
 
         cards.append(processed_card)
 
     return cards
 
 
+def fetch_card_rows(db_session, column, values):
+    """Load cards with group, price and attribute rows.
+
+    Attributes come back from their own query as plain (name, value,
+    display_name) rows, so nothing has to be packed into or parsed out of
+    an aggregated string.
+
+    Args:
+        db_session: Active database session
+        column: ``"id"`` or ``"product_id"``
+        values: Values of that column to load
+
+    Returns:
+        list: Card dictionaries (card columns, group_name,
+            group_abbreviation, price and ``attribute_rows``), in database order
+    """
+    if column not in ("id", "product_id"):
+        raise ValueError(f"Cannot load cards by {column}")
+    if not values:
+        return []
+
+    # The effective price (market, else mid) is kept on card_search
+    card_query = text(
+        "SELECT c.*, g.name as group_name, g.abbreviation as group_abbreviation, "
+        "cs.price "
+        "FROM cards c "
+        "LEFT JOIN groups g ON c.group_id = g.id "
+        "LEFT JOIN card_search cs ON cs.card_id = c.id "
+        f"WHERE c.{column} IN :values"
+    ).bindparams(bindparam("values", expanding=True))
+    cards = [
+        dict(row._mapping)
+        for row in db_session.execute(card_query, {"values": list(values)})
+    ]
+    if not cards:
+        return []
+    for card in cards:
+        card["price"] = price_to_json(card["price"])
+
+    attribute_query = text(
+        "SELECT card_id, name, value, display_name FROM card_attributes "
+        "WHERE card_id IN :card_ids AND value IS NOT NULL "
+        "ORDER BY card_id, id"
+    ).bindparams(bindparam("card_ids", expanding=True))
+    attributes_by_card = {card["id"]: [] for card in cards}
+    for card_id, name, value, display_name in db_session.execute(
+        attribute_query, {"card_ids": list(attributes_by_card)}
+    ):
+        attributes_by_card[card_id].append((name, value, display_name))
+
+    for card in cards:
+        card["attribute_rows"] = attributes_by_card[card["id"]]
+    return cards
+
+
+CARD_VIEWS = ("full", "grid")
+
+# Fields a "grid" card carries: what the card grids render, read straight
+# from cards + card_search without loading card_attributes
+GRID_CARD_FIELDS = (
+    "id",
+    "product_id",
+    "name",
+    "game",
+    "group_id",
+    "group_abbreviation",
+    "price",
+) + tuple(CARD_SEARCH_FIELDS)
+
+# Fields a "full" card carries: the keys _process_card_results sets plus
+# the attributes the scraper stores (attributes a card lacks are left out)
+FULL_CARD_FIELDS = (
+    "id",
+    "product_id",
+    "name",
+    "clean_name",
+    "card_url",
+    "game",
+    "category_id",
+    "group_id",
+    "group_name",
+    "group_abbreviation",
+    "image_count",
+    "is_presale",
+    "released_on",
+    "presale_note",
+    "modified_on",
+    "price",
+    "low_price",
+    "mid_price",
+    "high_price",
+    "created_at",
+    "attributes",
+    "card_text",
+    "trigger_text",
+) + tuple(CARD_SEARCH_FIELDS)
+
+CARD_VIEW_FIELDS = {"full": FULL_CARD_FIELDS, "grid": GRID_CARD_FIELDS}
+
+
+def _parse_card_projection(view, fields):
+    """Resolve the ``view`` and ``fields`` parameters of a card list request.
+
+    Args:
+        view: ``"full"`` (default) or ``"grid"``
+        fields: Optional top-level card keys to keep, as a list or a
+            comma-separated string
+
+    Returns:
+        tuple: (view to load, tuple of fields or None). A ``fields`` list
+            that only needs grid fields is served from the grid query.
+
+    Raises:
+        ValueError: If the view is unknown, or a field isn't a key of the
+            view's cards
+    """
+    view = view or "full"
+    if view not in CARD_VIEWS:
+        raise ValueError(f"view must be one of: {', '.join(CARD_VIEWS)}")
+
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    fields = tuple(field.strip() for field in fields or () if field.strip()) or None
+    unknown = [field for field in fields or () if field not in CARD_VIEW_FIELDS[view]]
+    if unknown:
+        raise ValueError(f"Unknown {view} card fields: {', '.join(unknown)}")
+    if fields and all(field in GRID_CARD_FIELDS for field in fields):
+        view = "grid"
+    return view, fields
+
+
+def _project_cards(cards, fields):
+    """Keep only the requested top-level keys of each card."""
+    if not fields:
+        return cards
+    return [{field: card[field] for field in fields if field in card} for card in cards]
+
+
+def fetch_grid_cards(db_session, column, values):
+    """Load the compact "grid" form of cards.
+
+    One query over cards, card_search and groups; card_search already
+    holds every filterable attribute and the effective price, so neither
+    card_attributes nor card_prices is read.
+
+    Args:
+        db_session: Active database session
+        column: ``"id"`` or ``"product_id"``
+        values: Values of that column to load
+
+    Returns:
+        list: Card dictionaries with GRID_CARD_FIELDS (attributes the card
+            doesn't have are left out, as in the full view), in database order
+    """
+    if column not in ("id", "product_id"):
+        raise ValueError(f"Cannot load cards by {column}")
+    if not values:
+        return []
+
+    search_columns = ", ".join(f"cs.{field}" for field in CARD_SEARCH_FIELDS)
+    query = text(
+        "SELECT c.id, c.product_id, c.name, c.game, c.group_id, "
+        "g.abbreviation as group_abbreviation, cs.price, "
+        f"{search_columns} "
+        "FROM cards c "
+        "LEFT JOIN card_search cs ON cs.card_id = c.id "
+        "LEFT JOIN groups g ON c.group_id = g.id "
+        f"WHERE c.{column} IN :values"
+    ).bindparams(bindparam("values", expanding=True))
+
+    cards = []
+    for row in db_session.execute(query, {"values": list(values)}):
+        card = dict(row._mapping)
+        card["price"] = price_to_json(card["price"])
+        for field in CARD_SEARCH_FIELDS:
+            if card[field] is None:
+                del card[field]
+        cards.append(card)
+    return cards
+
+
+def _load_cards(db_session, card_ids, view="full"):
+    """Load API-format cards for the given ids in the given order."""
+    if view == "grid":
+        cards_by_id = {
+            card["id"]: card for card in fetch_grid_cards(db_session, "id", card_ids)
+        }
+        return [cards_by_id[card_id] for card_id in card_ids if card_id in cards_by_id]
+    return _process_card_results(_fetch_cards_by_ids(db_session, card_ids))
+
+
+def _fetch_cards_by_ids(db_session, card_ids):
+    """Load cards with their attributes and price, keeping the given order.
+
+    Args:
+        db_session: Active database session
+        card_ids: Internal card ids, in the order they should be returned
+
+    Returns:
+        list: Card dictionaries from ``fetch_card_rows``
+    """
+    cards_by_id = {
+        card["id"]: card for card in fetch_card_rows(db_session, "id", card_ids)
+    }
+    return [cards_by_id[card_id] for card_id in card_ids if card_id in cards_by_id]
+
+
+COUNT_MODES = ("exact", "estimate", "none")
+
+# Whole /api/cards responses, keyed by catalog version + _search_cache_key
+search_cache = LRUCache(
+    "search_results", Config.SEARCH_CACHE_SIZE, Config.SEARCH_CACHE_TTL
+)
+
+# Exact totals, keyed by catalog version + filters + name terms, so every
+# sort and page of a search shares one COUNT(*)
+count_cache = LRUCache(
+    "search_counts", Config.SEARCH_CACHE_SIZE, Config.SEARCH_CACHE_TTL
+)
+
+
+def _estimate_row_count(db_session, from_where, params):
+    """Planner row estimate for a query, or None if the dialect has none."""
+    if _dialect_name(db_session) != "postgresql":
+        return None
+    plan = db_session.execute(
+        text(f"EXPLAIN (FORMAT JSON) SELECT 1 {from_where}"), params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _search_cache_key(
+    filters, search_query, sort_by, page, per_page, cursor, count_mode, projection
+):
+    """Build a canonical cache key for a search.
+
+    ``filters`` already include the expanded preset flags (``basic_prints``,
+    ``base_rarity``, ``no_ap``), so equivalent requests - presets vs the same
+    filters spelled out in ``q``, different filter order, different case -
+    share one key.
+
+    Raises:
+        ValueError: If a filter names an unknown field
+    """
+    shape, values = _filter_shape(filters)
+    return (
+        shape,
+        tuple(values),
+        search_query.lower(),
+        sort_by,
+        None if cursor else page,
+        per_page,
+        cursor,
+        count_mode,
+        projection,
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _search_statements(shape, has_search, dialect, sort_by, cursor_nulls):
+    """Build the page and count statements for one search shape.
+
+    Everything that varies between requests of the same shape is a bound
+    parameter, so the ``text()`` objects are memoized here and SQLAlchemy's
+    compiled cache reuses their compiled form.
+
+    Args:
+        shape: Filter shape from ``_filter_shape``
+        has_search: Whether there are name search terms
+        dialect: SQL dialect name
+        sort_by: Sort parameter string
+        cursor_nulls: For cursor pages, which cursor values are NULL;
+            None for offset pages
+
+    Returns:
+        tuple: (page statement, count statement, number of sort keys)
+    """
+    sort_keys = _sort_keys(sort_by, has_search)
+    where_clause = _where_clause_for_shape(shape, has_search, dialect)
+    order_clause = _build_sort_clause(sort_by, has_search)
+
+    # Count and page over cards + card_search only; attributes are loaded
+    # afterwards for the cards on this page. The page query carries no count,
+    # so with a sort index it stops after LIMIT rows.
+    count_statement = text(f"SELECT COUNT(*) as total {SEARCH_FROM} {where_clause}")
+
+    page_where = where_clause
+    if cursor_nulls is not None:
+        keyset_condition = _keyset_condition_for_shape(sort_keys, cursor_nulls)
+        page_where = (
+            f"{where_clause} AND {keyset_condition}"
+            if where_clause
+            else f"WHERE {keyset_condition}"
+        )
+
+    # Select the sort keys too, so the last row can become the next cursor.
+    # One extra row tells us whether another page follows.
+    key_columns = ", ".join(
+        f"{key[0]} AS sort_key_{i}" for i, key in enumerate(sort_keys)
+    )
+    page_statement = text(
+        f"SELECT c.id, {key_columns} {SEARCH_FROM} {page_where} {order_clause} "
+        f"LIMIT :limit OFFSET :offset"
+    )
+    return page_statement, count_statement, len(sort_keys)
+
+
+def get_statement_cache_stats():
+    """Get hit/miss counters of the memoized search SQL."""
+    stats = {}
+    for name, function in (
+        ("where_clauses", _where_clause_for_shape),
+        ("search_statements", _search_statements),
+    ):
+        info = function.cache_info()
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "entries": info.currsize,
+            "max_entries": info.maxsize,
+        }
+    return stats
+
+
+def _exact_count(db_session, count_statement, params, key):
+    """COUNT(*) of a search's matches, cached per catalog version and ``key``."""
+    key = (get_catalog_version(),) + key
+    total_cards = count_cache.get(key)
+    if total_cards is None:
+        total_cards = db_session.execute(count_statement, params).scalar()
+        count_cache.set(key, total_cards)
+    return total_cards
+
+
+def _sql_search_page(
+    db_session,
+    filters,
+    search_query,
+    sort_by,
+    page,
+    per_page,
+    cursor_values=None,
+    count_mode="exact",
+):
+    """Find one page of matching card ids with SQL.
+
+    Args:
+        db_session: Active database session
+        filters: Filter dictionaries (presets + query filters)
+        search_query: Name search terms
+        sort_by: Sort parameter string
+        page: Page number, used when there is no cursor
+        per_page: Page size
+        cursor_values: Decoded cursor sort values, or None
+        count_mode: One of COUNT_MODES
+
+    Returns:
+        dict: card_ids, last_sort_values (sort keys of the last row, for the
+            next cursor), has_more, total_cards, total_is_estimate
+    """
+    dialect = _dialect_name(db_session)
+    shape, values = _filter_shape(filters)
+    params = _where_params(shape, values, search_query, dialect)
+
+    page_params = params.copy()
+    cursor_nulls = None
+    if cursor_values is not None:
+        cursor_nulls = tuple(value is None for value in cursor_values)
+        page_params.update(
+            {
+                f"cursor_{i}": value
+                for i, value in enumerate(cursor_values)
+                if value is not None
+            }
+        )
+        offset = 0
+    else:
+        # Calculate offset for pagination
+        offset = (page - 1) * per_page
+    page_params["limit"] = per_page + 1
+    page_params["offset"] = offset
+
+    page_statement, count_statement, key_count = _search_statements(
+        shape, bool(search_query), dialect, sort_by, cursor_nulls
+    )
+
+    rows = db_session.execute(page_statement, page_params).fetchall()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    count_key = (dialect, shape, tuple(values), search_query.lower())
+    total_is_estimate = False
+    if count_mode == "none":
+        total_cards = None
+    elif cursor_values is None and not has_more and (rows or offset == 0):
+        # The last page of an offset search: its rows end the results
+        total_cards = offset + len(rows)
+    elif count_mode == "estimate":
+        where_clause = _where_clause_for_shape(shape, bool(search_query), dialect)
+        total_cards = _estimate_row_count(
+            db_session, f"{SEARCH_FROM} {where_clause}", params
+        )
+        total_is_estimate = total_cards is not None
+        if total_cards is None:
+            total_cards = _exact_count(db_session, count_statement, params, count_key)
+    else:
+        total_cards = _exact_count(db_session, count_statement, params, count_key)
+
+    return {
+        "card_ids": [row[0] for row in rows],
+        "last_sort_values": list(rows[-1][1 : key_count + 1]) if rows else None,
+        "has_more": has_more,
+        "total_cards": total_cards,
+        "total_is_estimate": total_is_estimate,
+    }
+
+
 def handle_api_search():
-    """Handle the /api/cards route with GET and query syntax."""
+    """Handle the /api/cards route with GET and query syntax.
+
+    Pages are addressed either by ``page`` (OFFSET) or by an opaque
+    ``cursor`` taken from a previous response's ``pagination.next_cursor``.
+    Cursors seek directly past the last row's sort key, so deep pages cost
+    the same as the first one.
+
+    ``count`` picks how ``total_cards`` is computed: ``exact`` (default,
+    a window count on the page query), ``estimate`` (planner estimate) or
+    ``none`` (skipped; ``has_next`` still comes from the page query).
+
+    ``view=grid`` returns the compact card form the grids render and
+    ``fields`` keeps only the listed card keys (see ``_parse_card_projection``).
+
+    With ``Config.SEARCH_ENGINE = "memory"`` matching ids come from the
+    in-process index in search_engine.py when it can answer the query.
+    """
+    try:
+        spec = _prepare_search(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    response = search_cache.get(spec["cache_key"])
+    if response is not None:
+        return jsonify(response)
+
     db_session = get_session()
+    try:
+        result = _run_search(db_session, spec)
+        cards = _project_cards(
+            _load_cards(db_session, result["card_ids"], spec["view"]), spec["fields"]
+        )
+    finally:
+        db_session.close()
+
+    response = _search_response(spec, result, cards)
+    search_cache.set(spec["cache_key"], response)
+    return jsonify(response)
+
+
+def _prepare_search(args):
+    """Validate one search's parameters and resolve its filters and cache key.
+
+    Args:
+        args: Request args, or one spec of a batch search
 
+    Returns:
+        dict: page, per_page, cursor, cursor_values, count_mode, sort_by,
+            search_query, filters, view, fields and cache_key
+
+    Raises:
+        ValueError: With a client-facing message when a parameter is invalid
+    """
     # Parse search parameters
-    params_data = _parse_search_params(request)
-    page = params_data["page"]
-    per_page = params_data["per_page"]
+    params_data = _parse_search_params(args)
     sort_by = params_data["sort_by"]
     search_query = params_data["search_query"]
-    query_filters = params_data["query_filters"]
-    query_fields = params_data["query_fields"]
+
+    count_mode = params_data["count_mode"]
+    if count_mode not in COUNT_MODES:
+        raise ValueError(f"count must be one of: {', '.join(COUNT_MODES)}")
+
+    view, fields = _parse_card_projection(args.get("view"), args.get("fields"))
+
+    cursor = params_data["cursor"]
+    cursor_values = None
+    if cursor:
+        cursor_values = _decode_cursor(
+            cursor, sort_by, len(_sort_keys(sort_by, search_query))
+        )
 
     # Apply preset filters and query filters
-    filters = _apply_preset_filters(request, query_fields)
-    filters.extend(query_filters)
-
-    # Build base query with group name
-    base_query = "FROM cards c LEFT JOIN groups g ON c.group_id = g.id"
-
-    # Build WHERE clause and parameters
-    where_clause, params = _build_where_conditions(filters, search_query)
-
-    # Build ORDER BY clause
-    order_clause = _build_sort_clause(sort_by)
-
-    # Get total count - need to match the main query structure with JOINs
-    count_query = f"SELECT COUNT(DISTINCT c.id) as total {base_query} LEFT JOIN card_attributes cm ON c.id = cm.card_id LEFT JOIN card_prices cp ON c.id = cp.card_id {where_clause}"
-    total_cards = db_session.execute(text(count_query), params).fetchone()[0]
-
-    # Calculate offset for pagination
-    offset = (page - 1) * per_page
-
-    # Get paginated results with metadata and prices (TCGCSV-aligned)
-    # Use market_price if available, otherwise fall back to mid_price
-    # Aggregate prices to avoid duplicates from multiple price records
-    search_query = (
-        f"SELECT c.*, g.name as group_name, g.abbreviation as group_abbreviation, STRING_AGG(cm.name || ':' || cm.value || ':' || cm.display_name, '|||') as metadata, "
-        f"COALESCE(MAX(cp.market_price), MAX(cp.mid_price)) as price {base_query} "
-        f"LEFT JOIN card_attributes cm ON c.id = cm.card_id "
-        f"LEFT JOIN card_prices cp ON c.id = cp.card_id "
-        f"{where_clause} "
-        f"GROUP BY c.id, g.name, g.abbreviation, g.published_on {order_clause} LIMIT :per_page OFFSET :offset"
+    filters = _apply_preset_filters(args, params_data["query_fields"])
+    filters.extend(params_data["query_filters"])
+
+    cache_key = (
+        get_catalog_version(),
+        _search_cache_key(
+            filters,
+            search_query,
+            sort_by,
+            params_data["page"],
+            params_data["per_page"],
+            cursor,
+            count_mode,
+            (view, fields),
+        ),
     )
-    search_params = params.copy()
-    search_params["per_page"] = per_page
-    search_params["offset"] = offset
+    return {
+        "page": params_data["page"],
+        "per_page": params_data["per_page"],
+        "cursor": cursor,
+        "cursor_values": cursor_values,
+        "count_mode": count_mode,
+        "sort_by": sort_by,
+        "search_query": search_query,
+        "filters": filters,
+        "view": view,
+        "fields": fields,
+        "cache_key": cache_key,
+    }
 
-    cursor = db_session.execute(text(search_query), search_params)
-    raw_cards = [row._mapping for row in cursor.fetchall()]
 
-    # Process card results
-    cards = _process_card_results(raw_cards)
+def _run_search(db_session, spec):
+    """Find the card ids of one prepared search's page (see _sql_search_page)."""
+    result = None
+    if Config.SEARCH_ENGINE == "memory":
+        import search_engine
 
-    db_session.close()
+        result = search_engine.search_page(
+            spec["filters"],
+            spec["search_query"],
+            spec["sort_by"],
+            spec["page"],
+            spec["per_page"],
+            spec["cursor_values"],
+        )
+
+    if result is None:
+        result = _sql_search_page(
+            db_session,
+            spec["filters"],
+            spec["search_query"],
+            spec["sort_by"],
+            spec["page"],
+            spec["per_page"],
+            spec["cursor_values"],
+            spec["count_mode"],
+        )
+    return result
+
+
+def _search_response(spec, result, cards):
+    """Build the /api/cards response body for a search page."""
+    page = spec["page"]
+    per_page = spec["per_page"]
+
+    has_next = result["has_more"]
+    next_cursor = None
+    if has_next and result["last_sort_values"] is not None:
+        next_cursor = _encode_cursor(spec["sort_by"], result["last_sort_values"])
 
     # Calculate pagination info
-    total_pages = (total_cards + per_page - 1) // per_page  # Ceiling division
-    has_prev = page > 1
-    has_next = page < total_pages
+    total_cards = result["total_cards"]
+    if total_cards is None:
+        total_pages = None
+    else:
+        total_pages = (total_cards + per_page - 1) // per_page  # Ceiling division
+    if spec["cursor_values"] is not None:
+        # Cursor pages have no page number
+        page = None
+        has_prev = True
+    else:
+        has_prev = page > 1
 
-    return jsonify(
-        {
-            "cards": cards,
-            "pagination": {
-                "current_page": page,
-                "per_page": per_page,
-                "total_cards": total_cards,
-                "total_pages": total_pages,
-                "has_prev": has_prev,
-                "has_next": has_next,
-                "prev_page": page - 1 if has_prev else None,
-                "next_page": page + 1 if has_next else None,
-            },
+    return {
+        "cards": cards,
+        "pagination": {
+            "current_page": page,
+            "per_page": per_page,
+            "total_cards": total_cards,
+            "total_pages": total_pages,
+            "total_is_estimate": result["total_is_estimate"],
+            "has_prev": has_prev,
+            "has_next": has_next,
+            "prev_page": page - 1 if page and has_prev else None,
+            "next_page": page + 1 if page and has_next else None,
+            "next_cursor": next_cursor,
+        },
+    }
+
+
+# Most searches one /api/cards/search/batch request may carry
+MAX_BATCH_SEARCHES = 20
+
+
+def _batch_spec_args(spec):
+    """Turn a JSON batch spec into request-args form.
+
+    Preset flags count when present in args, so false/null flags are dropped;
+    a ``fields`` list is joined into its comma-separated form.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("each search must be an object")
+    args = {}
+    for key, value in spec.items():
+        if value is None or value is False:
+            continue
+        if isinstance(value, list):
+            value = ",".join(str(item) for item in value)
+        args[key] = str(value)
+    return args
+
+
+def handle_api_search_batch():
+    """Handle POST /api/cards/search/batch: several /api/cards searches at once.
+
+    The body is ``{"searches": [spec, ...]}`` where each spec holds the
+    /api/cards query parameters (``q``, ``sort``, ``page``, ``per_page``,
+    ``cursor``, ``count``, ``view``, ``fields`` and the preset flags). All
+    searches run on one session, and cards shared between result sets are
+    loaded once. Results come back in request order, each in the /api/cards
+    response format.
+    """
+    data = request.get_json(silent=True)
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        return jsonify({"error": 'Body must be an object: {"searches": [...]}'}), 400
+    searches = data.get("searches")
+    if not isinstance(searches, list) or not searches:
+        return jsonify({"error": "searches must be a non-empty list"}), 400
+    if len(searches) > MAX_BATCH_SEARCHES:
+        return (
+            jsonify({"error": f"At most {MAX_BATCH_SEARCHES} searches per batch"}),
+            400,
+        )
+
+    specs = []
+    for i, search_spec in enumerate(searches):
+        try:
+            specs.append(_prepare_search(_batch_spec_args(search_spec)))
+        except ValueError as e:
+            return jsonify({"error": f"searches[{i}]: {e}"}), 400
+
+    responses = [search_cache.get(spec["cache_key"]) for spec in specs]
+    pending = [i for i, response in enumerate(responses) if response is None]
+    if not pending:
+        return jsonify({"results": responses})
+
+    db_session = get_session()
+    try:
+        results = {i: _run_search(db_session, specs[i]) for i in pending}
+
+        # Hydrate each card once per view, however many result sets hold it
+        ids_by_view = {}
+        for i in pending:
+            ids = ids_by_view.setdefault(specs[i]["view"], {})
+            ids.update(dict.fromkeys(results[i]["card_ids"]))
+        cards_by_view = {
+            view: {card["id"]: card for card in _load_cards(db_session, list(ids), view)}
+            for view, ids in ids_by_view.items()
         }
+    finally:
+        db_session.close()
+
+    for i in pending:
+        spec = specs[i]
+        loaded = cards_by_view[spec["view"]]
+        cards = [loaded[card_id] for card_id in results[i]["card_ids"] if card_id in loaded]
+        responses[i] = _search_response(
+            spec, results[i], _project_cards(cards, spec["fields"])
+        )
+        search_cache.set(spec["cache_key"], responses[i])
+
+    return jsonify({"results": responses})
+
+
+# Fields /api/cards/facets counts values for (card_number is unique per card)
+FACET_FIELDS = tuple(field for field in CARD_SEARCH_FIELDS if field != "card_number")
+
+facet_cache = LRUCache(
+    "search_facets", Config.SEARCH_CACHE_SIZE, Config.SEARCH_CACHE_TTL
+)
+
+
+@functools.lru_cache(maxsize=128)
+def _facet_statement(shape, has_search, dialect, fields):
+    """Build the single grouped aggregate behind /api/cards/facets.
+
+    PostgreSQL computes every field's value counts (and the overall total,
+    from the empty grouping set) in one scan with GROUPING SETS; the
+    GROUPING() bitmask tells which field a row belongs to. Other databases
+    get the equivalent UNION ALL.
+
+    Returns:
+        TextClause: Statement yielding (field, value, total) or
+            (grouping_mask, *field values, total) rows
+    """
+    where_clause = _where_clause_for_shape(shape, has_search, dialect)
+    if dialect == "postgresql":
+        columns = ", ".join(f"cs.{field}" for field in fields)
+        grouping_sets = ", ".join(f"(cs.{field})" for field in fields)
+        return text(
+            f"SELECT GROUPING({columns}) AS grouping_mask, {columns}, "
+            f"COUNT(*) AS total {SEARCH_FROM} {where_clause} "
+            f"GROUP BY GROUPING SETS ({grouping_sets}, ())"
+        )
+
+    selects = [
+        f"SELECT '{field}' AS field, cs.{field} AS value, COUNT(*) AS total "
+        f"{SEARCH_FROM} {where_clause} GROUP BY cs.{field}"
+        for field in fields
+    ]
+    selects.append(
+        f"SELECT NULL AS field, NULL AS value, COUNT(*) AS total "
+        f"{SEARCH_FROM} {where_clause}"
     )
+    return text(" UNION ALL ".join(selects))
+
+
+def _format_facets(counts, fields):
+    """Turn {field: {lowered value: [display value, count]}} into the response."""
+    return {
+        field: [
+            {"value": display, "count": count}
+            for display, count in sorted(
+                counts.get(field, {}).values(), key=lambda item: (-item[1], item[0])
+            )
+        ]
+        for field in fields
+    }
+
+
+def _sql_facets(db_session, filters, search_query, fields):
+    """Count matching cards per value of each facet field with one query."""
+    dialect = _dialect_name(db_session)
+    shape, values = _filter_shape(filters)
+    params = _where_params(shape, values, search_query, dialect)
+    statement = _facet_statement(shape, bool(search_query), dialect, fields)
+
+    rows = db_session.execute(statement, params).fetchall()
+
+    total_cards = 0
+    grouped = []
+    if dialect == "postgresql":
+        all_grouped = (1 << len(fields)) - 1
+        for row in rows:
+            mask = row[0]
+            if mask == all_grouped:
+                total_cards = row[-1]
+                continue
+            # GROUPING() sets a 0 bit for the column this row is grouped by;
+            # the first field is the most significant bit
+            index = next(
+                i for i in range(len(fields)) if not mask >> (len(fields) - 1 - i) & 1
+            )
+            grouped.append((fields[index], row[1 + index], row[-1]))
+    else:
+        for field, value, count in rows:
+            if field is None:
+                total_cards = count
+            else:
+                grouped.append((field, value, count))
+
+    # Filters compare case-insensitively, so case variants share one count
+    counts = {}
+    for field, value, count in grouped:
+        if not value:
+            continue
+        entry = counts.setdefault(field, {}).setdefault(value.lower(), [value, 0])
+        entry[0] = min(entry[0], value)
+        entry[1] += count
+
+    return {"total_cards": total_cards, "facets": _format_facets(counts, fields)}
+
+
+def handle_api_facets():
+    """Handle /api/cards/facets: per-value counts for the current search.
+
+    Takes the same ``q`` and preset flags as /api/cards and returns, for
+    every facet field (or the comma-separated ``fields`` subset), how many
+    of the matching cards each value would keep if it were added as a
+    filter. Counts are per stored value - the same values the filters
+    compare against.
+    """
+    requested = request.args.get("fields")
+    if requested:
+        fields = tuple(field.strip() for field in requested.split(",") if field.strip())
+        unknown = [field for field in fields if field not in FACET_FIELDS]
+        if unknown:
+            return jsonify({"error": f"Unknown facet field: {unknown[0]}"}), 400
+    else:
+        fields = FACET_FIELDS
+
+    try:
+        params_data = _parse_search_params(request.args)
+        filters = _apply_preset_filters(request.args, params_data["query_fields"])
+        filters.extend(params_data["query_filters"])
+        shape, values = _filter_shape(filters)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    search_query = params_data["search_query"]
+
+    cache_key = (
+        get_catalog_version(),
+        shape,
+        tuple(values),
+        search_query.lower(),
+        fields,
+    )
+    response = facet_cache.get(cache_key)
+    if response is not None:
+        return jsonify(response)
+
+    response = None
+    if Config.SEARCH_ENGINE == "memory":
+        import search_engine
+
+        response = search_engine.facets(filters, search_query, fields)
+
+    if response is None:
+        db_session = get_session()
+        try:
+            response = _sql_facets(db_session, filters, search_query, fields)
+        finally:
+            db_session.close()
+
+    facet_cache.set(cache_key, response)
+    return jsonify(response)
+
+
+# Filter field and value lists, computed once per catalog version (the key
+# includes it); the TTL is only a backstop
+filter_value_cache = LRUCache("filter_values", 256, 3600)
+
+
+def _cached_per_catalog_version(key, load):
+    """Get a catalog-derived value from filter_value_cache, loading it on a miss."""
+    cache_key = (get_catalog_version(),) + key
+    value = filter_value_cache.get(cache_key)
+    if value is None:
+        value = load()
+        filter_value_cache.set(cache_key, value)
+    return value
 
 
 def handle_filter_fields():
+    """Get all available filter fields (cached per catalog version)"""
+    return jsonify(_cached_per_catalog_version(("fields",), _load_filter_fields))
+
+
+def handle_filter_values(field, game=None):
+    """Get the unique values of a filter field (cached per catalog version)"""
+    return jsonify(
+        _cached_per_catalog_version(
+            ("values", field, game), lambda: _load_filter_values(field, game)
+        )
+    )
+
+
+def _load_filter_fields():
     """Get all available filter fields (excluding Description)"""
     db_session = get_session()
 
@@ -525,25 +1583,44 @@ def handle_filter_fields():
     # Sort by display name
     field_list.sort(key=lambda x: x["display"])
 
-    return jsonify(field_list)
+    return field_list
 
 
-def handle_filter_values(field, game=None):
+def _load_filter_values(field, game=None):
     """Get all unique values for a specific filter field, optionally filtered by game"""
 
     # Special handling for print_type field
     if field == "print_type":
         # Return all possible print types with proper casing
-        return jsonify(
-            [
-                "Base",
-                "Pre-Release",
-                "Starter Deck",
-                "Pre-Release Starter",
-                "Promotion",
-                "Box Topper Foil",
-            ]
+        return [
+            "Base",
+            "Pre-Release",
+            "Starter Deck",
+            "Pre-Release Starter",
+            "Promotion",
+            "Box Topper Foil",
+        ]
+
+    # Numeric fields come pre-parsed and sortable from their card_search column
+    if field in NUMERIC_SEARCH_FIELDS:
+        column = NUMERIC_SEARCH_FIELDS[field]
+        query = (
+            f"SELECT DISTINCT cs.{column} FROM card_search cs "
+            f"JOIN cards c ON c.id = cs.card_id "
+            f"WHERE cs.{column} IS NOT NULL"
         )
+        params = {}
+        if game:
+            query += " AND c.game = :game"
+            params["game"] = game
+        db_session = get_session()
+        try:
+            numbers = db_session.execute(
+                text(f"{query} ORDER BY cs.{column}"), params
+            ).scalars()
+            return [str(number) for number in numbers]
+        finally:
+            db_session.close()
 
     db_session = get_session()
 
@@ -584,7 +1661,11 @@ def handle_filter_values(field, game=None):
     db_session.close()
 
     # Extract the values from the result tuples
-    raw_values = [row[0] for row in values]
+    return _normalize_filter_values(field, [row[0] for row in values])
+
+
+def _normalize_filter_values(field, raw_values):
+    """Turn distinct stored values of a field into the values offered as filters."""
 
     # Special handling for affinities - split on " / " to get individual affinities
     if field == "affinities":
@@ -593,7 +1674,7 @@ def handle_filter_values(field, game=None):
             # Split on " / " and add each individual affinity
             affinities = [affinity.strip() for affinity in value.split(" / ")]
             individual_affinities.update(affinities)
-        return jsonify(sorted(list(individual_affinities)))
+        return sorted(list(individual_affinities))
 
     # Special handling for trigger_type - extract just the trigger type (first word in brackets)
     if field == "trigger_type":
@@ -611,43 +1692,70 @@ def handle_filter_values(field, game=None):
                         # Normalize case - capitalize first letter, lowercase the rest
                         normalized_word = first_word.capitalize()
                         trigger_types.add(normalized_word)
-        return jsonify(sorted(list(trigger_types)))
+        return sorted(list(trigger_types))
 
-    # Special handling for numeric fields - sort numerically instead of alphabetically
-    numeric_fields = [
-        "RequiredEnergy",
-        "ActionPointCost",
-        "BattlePointBP",
-    ]
+    return raw_values
 
-    if field in numeric_fields:
-        try:
-            # Convert to float, sort numerically, then back to string
-            numeric_values = []
-            for val in raw_values:
-                try:
-                    numeric_values.append(float(val))
-                except ValueError:
-                    # Skip non-numeric values
-                    continue
-
-            numeric_values.sort()
-            result = []
-            for val in numeric_values:
-                if val == float("inf"):
-                    continue  # Skip invalid numeric values
-                # Convert to int first to remove decimal places, then to string
-                if val.is_integer():
-                    result.append(str(int(val)))
-                else:
-                    result.append(str(val))
-
-            return jsonify(result)
-        except:
-            # If anything fails, fall back to string sorting
-            return jsonify(raw_values)
-
-    return jsonify(raw_values)
+
+def _load_conditional_values(field, given_field, game):
+    """Map each value of given_field to the filter values of field seen with it.
+
+    One GROUP BY over card_search yields every (given, value) pair, e.g. each
+    series with each of its colors.
+    """
+    # Numeric values sort by their integer column (its value follows from
+    # the text value, so grouping by it too changes nothing)
+    order_column = NUMERIC_SEARCH_FIELDS.get(field, field)
+
+    db_session = get_session()
+    try:
+        pairs = db_session.execute(
+            text(
+                f"SELECT cs.{given_field}, cs.{field} FROM card_search cs "
+                "JOIN cards c ON c.id = cs.card_id "
+                f"WHERE c.game = :game AND cs.{given_field} IS NOT NULL "
+                f"AND cs.{field} IS NOT NULL AND cs.{field} <> '' "
+                f"GROUP BY cs.{given_field}, cs.{field}, cs.{order_column} "
+                f"ORDER BY cs.{order_column}, cs.{field}"
+            ),
+            {"game": game},
+        ).fetchall()
+    finally:
+        db_session.close()
+
+    grouped = {}
+    for given, value in pairs:
+        grouped.setdefault(given, []).append(value)
+
+    return {
+        given: _normalize_filter_values(field, values)
+        for given, values in grouped.items()
+    }
+
+
+def handle_conditional_values(field, given_field, given_value=None, game="Union Arena"):
+    """Get the values of one attribute among cards with a given value of another.
+
+    Args:
+        field: Attribute whose values are listed (e.g. activation_energy)
+        given_field: Attribute conditioned on (e.g. series)
+        given_value: Value of given_field; when omitted the whole
+            given value -> values map is returned
+        game: Game to look at
+
+    The map is built once per catalog version and game.
+    """
+    for name in (field, given_field):
+        if name not in CARD_SEARCH_FIELDS:
+            return jsonify({"error": f"Unknown attribute: {name}"}), 400
+
+    values_by_given = _cached_per_catalog_version(
+        ("conditional", field, given_field, game),
+        lambda: _load_conditional_values(field, given_field, game),
+    )
+    if given_value is None:
+        return jsonify(values_by_given)
+    return jsonify(values_by_given.get(given_value, []))
 
 
 def get_print_type_values():
@@ -0,0 +1,482 @@
+"""
+In-process search engine for /api/cards.
+
+The card catalog is small enough to hold in memory, so with
+Config.SEARCH_ENGINE = "memory" each worker answers card searches from an
+inverted index instead of querying PostgreSQL for every request:
+
+- every card gets a dense ordinal, and every (field, value) pair in
+  card_search maps to a bitmap of ordinals (a Python int used as a bitset),
+  so AND / OR / NOT filters are integer bit operations; values held by few
+  cards (card numbers, most numbers) keep a sorted array of ordinals
+  instead, so the index grows linearly with the catalog
+- each sort keeps the catalog presorted as a list of ordinals; the order is
+  read from the database once, so collation and NULL placement match the
+  SQL path exactly, and a page is a walk along that list
+- the index remembers the catalog version it was built from and is rebuilt
+  when the scraper bumps it (see catalog.py); requests arriving during a
+  rebuild are answered from the previous index
+
+Only the page of card ids comes from here; attributes and prices are still
+loaded by ``search._fetch_cards_by_ids``. Queries the index can't answer the
+same way SQL would (``t:`` card text filters, direct card column filters)
+return None and the caller falls back to SQL.
+"""
+
+import heapq
+import threading
+import time
+from array import array
+
+from sqlalchemy import text
+
+from catalog import get_catalog_version
+from database import get_session
+from models import CARD_SEARCH_FIELDS, NUMERIC_SEARCH_FIELDS
+from search import (
+    SEARCH_FROM,
+    _build_sort_clause,
+    _format_facets,
+    _sort_keys,
+    normalize_field_name,
+)
+
+# Below this fraction of the catalog, matches are sorted directly instead of
+# walking the presorted list
+DIRECT_SORT_RATIO = 16
+
+# Postings matching under 1/SPARSE_RATIO of the catalog are stored as arrays
+# of ordinals (4 bytes per card) rather than bitmaps (catalog size / 8 bytes)
+SPARSE_RATIO = 32
+
+
+def _bitmap(ordinals, size):
+    """Build a bitmap int from an iterable of ordinals."""
+    buf = bytearray((size + 7) // 8)
+    for ordinal in ordinals:
+        buf[ordinal >> 3] |= 1 << (ordinal & 7)
+    return int.from_bytes(buf, "little")
+
+
+def _posting(ordinals, size):
+    """Store a posting list as a bitmap, or as an array if it is sparse."""
+    if len(ordinals) * SPARSE_RATIO < size:
+        return array("I", ordinals)
+    return _bitmap(ordinals, size)
+
+
+def _as_bitmap(posting, size):
+    """Get a posting (bitmap or ordinal array) as a bitmap."""
+    if isinstance(posting, int):
+        return posting
+    return _bitmap(posting, size)
+
+
+def _ordinals(bits):
+    """List the ordinals set in a bitmap, in ascending order."""
+    result = []
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    for byte_index, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            result.append((byte_index << 3) + low.bit_length() - 1)
+            byte ^= low
+    return result
+
+
+class CatalogIndex:
+    """Bitmap inverted index over card_search for one catalog version."""
+
+    def __init__(self, version, rows):
+        """
+        Args:
+            version: Catalog version the rows were read at
+            rows: Mappings with id, name, clean_name, game and every
+                CARD_SEARCH_FIELDS column
+        """
+        self.version = version
+        self.card_ids = [row["id"] for row in rows]
+        self.size = len(self.card_ids)
+        self.ordinal_by_id = {card_id: i for i, card_id in enumerate(self.card_ids)}
+        self.all_bits = (1 << self.size) - 1
+        self.names = [row["name"] or "" for row in rows]
+        self.lower_names = [name.lower() for name in self.names]
+        self.lower_clean_names = [(row["clean_name"] or "").lower() for row in rows]
+
+        postings = {}
+        # Stored spelling shown for each lowered value (facets)
+        self.display_values = {}
+        for i, row in enumerate(rows):
+            postings.setdefault(("game", row["game"]), []).append(i)
+            for field in CARD_SEARCH_FIELDS:
+                value = row[field]
+                if value is not None:
+                    key = (field, value.lower())
+                    postings.setdefault(key, []).append(i)
+                    if key not in self.display_values or value < self.display_values[key]:
+                        self.display_values[key] = value
+        self.postings = {
+            key: _posting(ordinals, self.size) for key, ordinals in postings.items()
+        }
+
+        # field -> {integer value: posting} for numeric comparisons
+        numeric = {field: {} for field in NUMERIC_SEARCH_FIELDS}
+        for i, row in enumerate(rows):
+            for field, column in NUMERIC_SEARCH_FIELDS.items():
+                if row[column] is not None:
+                    numeric[field].setdefault(row[column], []).append(i)
+        self.numeric_postings = {
+            field: {
+                number: _posting(ordinals, self.size)
+                for number, ordinals in by_value.items()
+            }
+            for field, by_value in numeric.items()
+        }
+
+        # sort_by -> (ordinals in order, position by ordinal, sort key values)
+        self._orders = {}
+        self._orders_lock = threading.Lock()
+
+    def match(self, filters, search_query):
+        """Evaluate filters the way ``search._build_where_conditions`` does.
+
+        Returns:
+            int: Bitmap of matching ordinals, or None if a filter isn't
+                supported by the index
+        """
+        bits = self.all_bits
+
+        if search_query:
+            needle = search_query.lower()
+            bits = _bitmap(
+                (
+                    i
+                    for i in range(self.size)
+                    if needle in self.lower_names[i] or needle in self.lower_clean_names[i]
+                ),
+                self.size,
+            )
+
+        or_groups = {}
+        for filter_item in filters:
+            filter_type = filter_item.get("type", "and")
+            field = filter_item.get("field", "")
+            value = filter_item.get("value", "")
+
+            if not field or not value:
+                continue
+
+            column = normalize_field_name(field)
+            op = filter_item.get("op")
+            if op:
+                if column not in NUMERIC_SEARCH_FIELDS:
+                    return None
+                posting = self._compare(column, op, int(value))
+            elif field == "game":
+                posting = _as_bitmap(self.postings.get(("game", value), 0), self.size)
+            elif column in CARD_SEARCH_FIELDS:
+                posting = _as_bitmap(
+                    self.postings.get((column, value.lower()), 0), self.size
+                )
+            else:
+                # card_text and direct card columns stay in SQL
+                return None
+
+            if filter_type == "and":
+                bits &= posting
+            elif filter_type == "or":
+                or_groups[field] = or_groups.get(field, 0) | posting
+            elif filter_type == "not":
+                bits &= ~posting
+
+        for posting in or_groups.values():
+            bits &= posting
+        return bits & self.all_bits
+
+    def _compare(self, field, op, number):
+        """Bitmap of cards whose numeric field satisfies ``<value> op number``."""
+        test = {
+            ">=": number.__le__,
+            "<=": number.__ge__,
+            ">": number.__lt__,
+            "<": number.__gt__,
+            "=": number.__eq__,
+        }[op]
+        bits = 0
+        sparse = []
+        for value, posting in self.numeric_postings[field].items():
+            if test(value):
+                if isinstance(posting, int):
+                    bits |= posting
+                else:
+                    sparse.extend(posting)
+        return bits | _bitmap(sparse, self.size)
+
+    def facets(self, filters, search_query, fields):
+        """Count matches per value of each facet field; same shape as ``search._sql_facets``."""
+        bits = self.match(filters, search_query)
+        if bits is None:
+            return None
+
+        mask = bits.to_bytes((self.size + 7) // 8, "little")
+        counts = {}
+        for key, posting in self.postings.items():
+            field, value = key
+            if field not in fields or not value:
+                continue
+            if isinstance(posting, int):
+                count = (posting & bits).bit_count()
+            else:
+                count = sum(mask[ordinal >> 3] >> (ordinal & 7) & 1 for ordinal in posting)
+            if count:
+                counts.setdefault(field, {})[value] = [self.display_values[key], count]
+
+        return {"total_cards": bits.bit_count(), "facets": _format_facets(counts, fields)}
+
+    def _order(self, sort_by):
+        """Get the presorted ordinals for a sort, reading it from the database once."""
+        order = self._orders.get(sort_by)
+        if order is not None:
+            return order
+
+        with self._orders_lock:
+            order = self._orders.get(sort_by)
+            if order is not None:
+                return order
+
+            sort_keys = _sort_keys(sort_by)
+            key_columns = ", ".join(
+                f"{key[0]} AS sort_key_{i}" for i, key in enumerate(sort_keys)
+            )
+            db_session = get_session()
+            try:
+                rows = db_session.execute(
+                    text(
+                        f"SELECT c.id, {key_columns} {SEARCH_FROM} "
+                        f"{_build_sort_clause(sort_by)}"
+                    )
+                ).fetchall()
+            finally:
+                db_session.close()
+
+            ordinals = []
+            sort_values = []
+            for row in rows:
+                ordinal = self.ordinal_by_id.get(row[0])
+                if ordinal is None:
+                    # Card added after this index was built
+                    continue
+                ordinals.append(ordinal)
+                sort_values.append(list(row[1 : len(sort_keys) + 1]))
+
+            positions = [-1] * self.size
+            for position, ordinal in enumerate(ordinals):
+                positions[ordinal] = position
+
+            order = (ordinals, positions, sort_values)
+            self._orders[sort_by] = order
+            return order
+
+    def _relevance_page(self, bits, search_query, offset, limit, cursor_values):
+        """Rank name matches like the SQL relevance sort."""
+        needle = search_query.lower()
+        prefix_word = f" {needle}"
+        name_positions = self._order("name_asc")[1]
+
+        def rank(ordinal):
+            name = self.lower_names[ordinal]
+            if name == needle:
+                return 0
+            if name.startswith(needle):
+                return 1
+            if prefix_word in name:
+                return 2
+            return 3
+
+        def key(ordinal):
+            # name_asc position orders by c.name, then card_id, in DB collation
+            return (rank(ordinal), len(self.names[ordinal]), name_positions[ordinal])
+
+        matches = _ordinals(bits)
+        if cursor_values is not None:
+            cursor_ordinal = self.ordinal_by_id.get(cursor_values[-1])
+            if cursor_ordinal is None:
+                return None
+            after = key(cursor_ordinal)
+            matches = [ordinal for ordinal in matches if key(ordinal) > after]
+            offset = 0
+
+        selected = heapq.nsmallest(offset + limit, matches, key=key)[offset:]
+        return [
+            (
+                ordinal,
+                [
+                    rank(ordinal),
+                    len(self.names[ordinal]),
+                    self.names[ordinal],
+                    self.card_ids[ordinal],
+                ],
+            )
+            for ordinal in selected
+        ]
+
+    def _sorted_page(self, bits, sort_by, offset, limit, cursor_values):
+        """Take a page of matches off the presorted list for a sort."""
+        ordinals, positions, sort_values = self._order(sort_by)
+
+        start = 0
+        if cursor_values is not None:
+            cursor_ordinal = self.ordinal_by_id.get(cursor_values[-1])
+            if cursor_ordinal is None:
+                return None
+            if positions[cursor_ordinal] < 0:
+                return None
+            start = positions[cursor_ordinal] + 1
+            offset = 0
+
+        if bits == self.all_bits:
+            begin = start + offset
+            return [
+                (ordinals[position], sort_values[position])
+                for position in range(begin, min(begin + limit, len(ordinals)))
+            ]
+
+        if bits.bit_count() * DIRECT_SORT_RATIO < len(ordinals):
+            # Few matches: sort just those by their position in the order
+            matched = sorted(
+                position
+                for position in (positions[ordinal] for ordinal in _ordinals(bits))
+                if position >= start
+            )
+            return [
+                (ordinals[position], sort_values[position])
+                for position in matched[offset : offset + limit]
+            ]
+
+        mask = bits.to_bytes((self.size + 7) // 8, "little")
+        page = []
+        skipped = 0
+        for position in range(start, len(ordinals)):
+            ordinal = ordinals[position]
+            if not mask[ordinal >> 3] >> (ordinal & 7) & 1:
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            page.append((ordinal, sort_values[position]))
+            if len(page) == limit:
+                break
+        return page
+
+    def search_page(self, filters, search_query, sort_by, page, per_page, cursor_values=None):
+        """Find one page of card ids; same result shape as ``search._sql_search_page``."""
+        bits = self.match(filters, search_query)
+        if bits is None:
+            return None
+
+        offset = (page - 1) * per_page
+        limit = per_page + 1
+        if sort_by == "relevance" and search_query:
+            rows = self._relevance_page(bits, search_query, offset, limit, cursor_values)
+        else:
+            rows = self._sorted_page(bits, sort_by, offset, limit, cursor_values)
+        if rows is None:
+            return None
+
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        return {
+            "card_ids": [self.card_ids[ordinal] for ordinal, _ in rows],
+            "last_sort_values": rows[-1][1] if rows else None,
+            "has_more": has_more,
+            # Bit counts are exact and cheap, whatever count mode was asked for
+            "total_cards": bits.bit_count(),
+            "total_is_estimate": False,
+        }
+
+
+_index = None
+_build_lock = threading.Lock()
+_stats = {"builds": 0, "last_build_ms": None, "searches": 0, "fallbacks": 0}
+
+
+def _build_index(version):
+    columns = ", ".join(
+        f"cs.{field}"
+        for field in CARD_SEARCH_FIELDS + list(NUMERIC_SEARCH_FIELDS.values())
+    )
+    db_session = get_session()
+    try:
+        rows = db_session.execute(
+            text(
+                f"SELECT c.id, c.name, c.clean_name, c.game, {columns} "
+                f"{SEARCH_FROM} ORDER BY c.id"
+            )
+        ).fetchall()
+    finally:
+        db_session.close()
+    return CatalogIndex(version, [row._mapping for row in rows])
+
+
+def get_index():
+    """Get the index for the current catalog version, rebuilding it if stale."""
+    global _index
+
+    version = get_catalog_version()
+    index = _index
+    if index is not None and index.version == version:
+        return index
+
+    # While one request rebuilds, others keep answering from the previous index
+    if not _build_lock.acquire(blocking=index is None):
+        return index
+    try:
+        if _index is None or _index.version != version:
+            started = time.perf_counter()
+            _index = _build_index(version)
+            _stats["builds"] += 1
+            _stats["last_build_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            print(
+                f"Built in-memory search index: {_index.size} cards "
+                f"(catalog version {version}, {_stats['last_build_ms']} ms)"
+            )
+        return _index
+    finally:
+        _build_lock.release()
+
+
+def search_page(filters, search_query, sort_by, page, per_page, cursor_values=None):
+    """Answer a search page from the in-memory index.
+
+    Returns:
+        dict: Same shape as ``search._sql_search_page``, or None when the
+            query needs the SQL path
+    """
+    result = get_index().search_page(
+        filters, search_query, sort_by, page, per_page, cursor_values
+    )
+    _stats["searches"] += 1
+    if result is None:
+        _stats["fallbacks"] += 1
+    return result
+
+
+def facets(filters, search_query, fields):
+    """Answer a facets request from the in-memory index (None: use SQL)."""
+    return get_index().facets(filters, search_query, fields)
+
+
+def get_engine_stats():
+    """Get index build and usage counters."""
+    index = _index
+    return {
+        **_stats,
+        "version": index.version if index else None,
+        "cards": index.size if index else 0,
+        "postings": len(index.postings) if index else 0,
+        "sparse_postings": (
+            sum(not isinstance(posting, int) for posting in index.postings.values())
+            if index
+            else 0
+        ),
+    }
@@ -0,0 +1,192 @@
+"""
+Search box autocomplete for /api/cards/suggest.
+
+Suggestions (card names, series and card numbers) come from an in-memory
+prefix trie, so answering a keystroke never touches the database:
+
+- every suggestion is inserted under its whole lowercased text and under
+  each later word start ("captain levi" is also found by "levi"); a card's
+  clean_name is inserted as another key for the same name
+- each trie node keeps its top SUGGEST_TOP_N suggestions, precomputed at
+  build time, so a lookup is one dict step per typed character
+- the trie is tagged with the catalog version and rebuilt when the scraper
+  bumps it (see catalog.py)
+"""
+
+import re
+import threading
+import time
+
+from sqlalchemy import text
+
+from catalog import get_catalog_version
+from database import get_session
+
+# Suggestions kept per trie node (the most a request can ask for)
+SUGGEST_TOP_N = 10
+
+# Marker key under which a node stores its top suggestions
+_TOP = None
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(value):
+    """Lowercase and collapse whitespace, the form keys and prefixes are matched in."""
+    return _WHITESPACE.sub(" ", value).strip().lower()
+
+
+def _key_starts(key):
+    """Positions in a key where a match may start: the start and each word start."""
+    return [0] + [i + 1 for i, char in enumerate(key) if char == " " and i + 1 < len(key)]
+
+
+class SuggestTrie:
+    """Prefix trie over suggestion texts for one catalog version."""
+
+    def __init__(self, version, entries):
+        """
+        Args:
+            version: Catalog version the entries were read at
+            entries: (type, value, card_count, keys) tuples; keys are the
+                texts the suggestion can be found by
+        """
+        self.version = version
+        self.entries = [
+            {"type": kind, "value": value, "count": count}
+            for kind, value, count, _ in entries
+        ]
+
+        # Whole-text matches rank above word matches, then more cards first,
+        # then shorter and alphabetical
+        insertions = []
+        for entry_id, (_, value, count, keys) in enumerate(entries):
+            for key in {_normalize(key) for key in keys if key}:
+                for start in _key_starts(key):
+                    rank = (start > 0, -count, len(value), value)
+                    insertions.append((rank, key[start:], entry_id))
+        insertions.sort()
+
+        # Inserting best-first means each node's list fills with its top N
+        self.root = {_TOP: []}
+        for _, key, entry_id in insertions:
+            node = self.root
+            self._keep(node, entry_id)
+            for char in key:
+                child = node.get(char)
+                if child is None:
+                    child = node[char] = {_TOP: []}
+                node = child
+                self._keep(node, entry_id)
+        self.node_count = self._count_nodes()
+
+    @staticmethod
+    def _keep(node, entry_id):
+        top = node[_TOP]
+        if len(top) < SUGGEST_TOP_N and entry_id not in top:
+            top.append(entry_id)
+
+    def _count_nodes(self):
+        count = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(child for key, child in node.items() if key is not _TOP)
+        return count
+
+    def suggest(self, prefix, limit=SUGGEST_TOP_N):
+        """Get the top suggestions for a prefix."""
+        node = self.root
+        for char in _normalize(prefix):
+            node = node.get(char)
+            if node is None:
+                return []
+        return [self.entries[entry_id] for entry_id in node[_TOP][:limit]]
+
+
+_trie = None
+_build_lock = threading.Lock()
+_stats = {"builds": 0, "last_build_ms": None, "lookups": 0}
+
+
+def _load_entries():
+    """Read suggestion texts from cards and card_search."""
+    db_session = get_session()
+    try:
+        names = db_session.execute(
+            text(
+                "SELECT name, clean_name, COUNT(*) FROM cards "
+                "WHERE name IS NOT NULL AND name <> '' "
+                "GROUP BY name, clean_name"
+            )
+        ).fetchall()
+        series = db_session.execute(
+            text(
+                "SELECT series, COUNT(*) FROM card_search "
+                "WHERE series IS NOT NULL GROUP BY series"
+            )
+        ).fetchall()
+        numbers = db_session.execute(
+            text(
+                "SELECT card_number, COUNT(*) FROM card_search "
+                "WHERE card_number IS NOT NULL GROUP BY card_number"
+            )
+        ).fetchall()
+    finally:
+        db_session.close()
+
+    # One name suggestion per name, findable by any of its clean_names
+    name_keys = {}
+    for name, clean_name, count in names:
+        keys, total = name_keys.get(name, ([name], 0))
+        if clean_name:
+            keys.append(clean_name)
+        name_keys[name] = (keys, total + count)
+
+    entries = [
+        ("name", name, count, keys) for name, (keys, count) in name_keys.items()
+    ]
+    entries.extend(("series", value, count, [value]) for value, count in series)
+    entries.extend(("card_number", value, count, [value]) for value, count in numbers)
+    return entries
+
+
+def get_trie():
+    """Get the trie for the current catalog version, rebuilding it if stale."""
+    global _trie
+
+    version = get_catalog_version()
+    trie = _trie
+    if trie is not None and trie.version == version:
+        return trie
+
+    with _build_lock:
+        if _trie is None or _trie.version != version:
+            started = time.perf_counter()
+            _trie = SuggestTrie(version, _load_entries())
+            _stats["builds"] += 1
+            _stats["last_build_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            print(
+                f"Built suggest trie: {len(_trie.entries)} suggestions, "
+                f"{_trie.node_count} nodes (catalog version {version}, "
+                f"{_stats['last_build_ms']} ms)"
+            )
+        return _trie
+
+
+def suggest(prefix, limit=SUGGEST_TOP_N):
+    """Get up to ``limit`` (clamped to 1..SUGGEST_TOP_N) suggestions for a typed prefix."""
+    _stats["lookups"] += 1
+    return get_trie().suggest(prefix, max(1, min(limit, SUGGEST_TOP_N)))
+
+
+def get_suggest_stats():
+    """Get trie build and lookup counters."""
+    trie = _trie
+    return {
+        **_stats,
+        "version": trie.version if trie else None,
+        "suggestions": len(trie.entries) if trie else 0,
+        "nodes": trie.node_count if trie else 0,
+    }
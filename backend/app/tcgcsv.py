@@ -0,0 +1,187 @@
+"""
+HTTP client for TCGCSV (https://tcgcsv.com) JSON endpoints.
+
+- responses are cached on disk with their ETag/Last-Modified; later
+  requests send If-None-Match/If-Modified-Since and a 304 is answered from
+  the cached body, so unchanged endpoints cost no download
+- connections are pooled, every request has a (connect, read) timeout, and
+  transport errors (connection errors, timeouts, dropped bodies, ...), 429
+  and 5xx responses are retried with exponential backoff and full jitter
+- requests, cache hits, retries and errors are counted per client, and
+  ``summary()`` formats them for a run's log
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import Config
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# Statuses worth retrying; anything else is returned to the caller as is
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+logger = logging.getLogger(__name__)
+
+
+class TCGCSVClient:
+    """Pooled, retrying TCGCSV client with an on-disk conditional cache."""
+
+    def __init__(self, cache_dir=None, pool_size=10, rate_limiter=None):
+        """
+        Args:
+            cache_dir: Directory for cached responses (default
+                Config.TCGCSV_CACHE_DIR); an empty string disables caching
+            pool_size: Connections kept open (one per fetching thread)
+            rate_limiter: Object whose acquire() is called before every
+                request attempt (see scraper.TokenBucket)
+        """
+        self.cache_dir = Config.TCGCSV_CACHE_DIR if cache_dir is None else cache_dir
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        self.rate_limiter = rate_limiter
+        self.timeout = (Config.TCGCSV_CONNECT_TIMEOUT, Config.TCGCSV_READ_TIMEOUT)
+
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+        self.session.mount(
+            "https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        )
+
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "cache_hits": 0,
+            "downloads": 0,
+            "retries": 0,
+            "errors": 0,
+            "bytes": 0,
+            "request_seconds": 0.0,
+        }
+
+    def _count(self, **counts):
+        with self._lock:
+            for key, value in counts.items():
+                self.stats[key] += value
+
+    def _cache_path(self, url):
+        return os.path.join(
+            self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + ".json"
+        )
+
+    def _read_cache(self, url):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_path(url)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def _write_cache(self, url, response, body):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not self.cache_dir or not (etag or last_modified):
+            return
+        path = self._cache_path(url)
+        # Write then rename, so a crash or a concurrent reader never sees half a file
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(
+                    {
+                        "url": url,
+                        "etag": etag,
+                        "last_modified": last_modified,
+                        "body": body,
+                    },
+                    f,
+                )
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache TCGCSV response for {url}: {e}")
+
+    def _request(self, url, headers):
+        """GET with retries; returns the last response, or None if none came back."""
+        for attempt in range(Config.TCGCSV_RETRIES + 1):
+            if attempt:
+                # Full jitter: a random wait up to the exponential backoff
+                self._count(retries=1)
+                backoff = min(Config.TCGCSV_BACKOFF_MAX, Config.TCGCSV_BACKOFF * 2 ** (attempt - 1))
+                time.sleep(random.uniform(0, backoff))
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                # Connection errors, timeouts, dropped or undecodable bodies,
+                # redirect loops: all retried like a 5xx
+                error = e
+                response = None
+            finally:
+                self._count(requests=1, request_seconds=time.perf_counter() - started)
+
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                return response
+            if response is not None:
+                error = f"HTTP {response.status_code}"
+            logger.warning(f"TCGCSV request failed (attempt {attempt + 1}): {url}: {error}")
+        return response
+
+    def get_json(self, url):
+        """Get a TCGCSV endpoint's JSON body.
+
+        Returns:
+            The decoded body (from the cache on a 304), or None if the
+            request failed
+        """
+        entry = self._read_cache(url)
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self._request(url, headers)
+        if response is None:
+            self._count(errors=1)
+            return None
+        if response.status_code == 304 and entry:
+            self._count(cache_hits=1)
+            return entry["body"]
+        if response.status_code != 200:
+            self._count(errors=1)
+            return None
+
+        try:
+            body = response.json()
+        except ValueError:
+            self._count(errors=1)
+            return None
+        self._count(downloads=1, bytes=len(response.content))
+        self._write_cache(url, response, body)
+        return body
+
+    def summary(self):
+        """One-line summary of this client's requests for a run's log."""
+        stats = self.stats
+        fetched = stats["cache_hits"] + stats["downloads"]
+        hit_rate = stats["cache_hits"] / fetched * 100 if fetched else 0
+        return (
+            f"TCGCSV: {stats['requests']} requests, {stats['cache_hits']} not modified "
+            f"({hit_rate:.0f}% cache hits), {stats['downloads']} downloaded "
+            f"({stats['bytes'] / 1024:.0f} KB), {stats['retries']} retries, "
+            f"{stats['errors']} errors"
+        )
@@ -281,6 +281,31 @@ class TestSeriesSpecificColors:
         assert isinstance(data, list)
         assert len(data) > 0
 
+    def test_conditional_attribute_values(self):
+        """Test the generalized attribute-by-attribute endpoint against colors"""
+        print(f"\n[TEST] Testing attribute values by series...")
+        response = requests.get(
+            f"{BASE_URL}/api/cards/attributes/activation_energy/by/series"
+        )
+        assert response.status_code == 200
+
+        data = response.json()
+        print(f"   [INFO] Series with colors: {len(data)}")
+        assert isinstance(data, dict)
+        colors = requests.get(
+            f"{BASE_URL}/api/cards/colors/Bleach?game=Union%20Arena"
+        ).json()
+        assert data.get("Bleach", []) == colors
+
+        response = requests.get(
+            f"{BASE_URL}/api/cards/attributes/rarity/by/series?value=Bleach"
+        )
+        assert response.status_code == 200
+        assert isinstance(response.json(), list)
+
+        response = requests.get(f"{BASE_URL}/api/cards/attributes/color/by/series")
+        assert response.status_code == 400
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -74,6 +74,263 @@ class TestPublicEndpoints:
             f"   [OK] Red color filter found {data['pagination']['total_cards']} cards"
         )
 
+    def test_cards_search_name_relevance(self):
+        """Test that name searches rank exact and prefix matches first"""
+        print(f"\n[TEST] Testing name search relevance ranking...")
+        response = requests.get(f"{BASE_URL}/api/cards?q=rapi&per_page=5")
+        assert response.status_code == 200
+
+        data = response.json()
+        print(f"   [OK] Query 'rapi' found {data['pagination']['total_cards']} cards")
+        names = [card["name"].lower() for card in data["cards"]]
+        print(f"   [INFO] Top matches: {names}")
+
+        # Names starting with the term come before names that only contain it
+        starts = [name.startswith("rapi") for name in names]
+        assert starts == sorted(starts, reverse=True)
+
+    def test_cards_search_card_text(self):
+        """Test full-text search over card name and card text (t: field)"""
+        print(f"\n[TEST] Testing card text search...")
+        response = requests.get(f"{BASE_URL}/api/cards?q=t:draw&per_page=3")
+        assert response.status_code == 200
+
+        data = response.json()
+        print(f"   [OK] Text 'draw' found {data['pagination']['total_cards']} cards")
+        assert data["pagination"]["total_cards"] > 0
+
+    def test_cards_search_cursor_pagination(self):
+        """Test that next_cursor pages match page-number pages"""
+        print(f"\n[TEST] Testing cursor pagination...")
+        response = requests.get(f"{BASE_URL}/api/cards?sort=name_asc&per_page=10")
+        assert response.status_code == 200
+        first = response.json()
+        next_cursor = first["pagination"]["next_cursor"]
+        assert next_cursor
+
+        response = requests.get(
+            f"{BASE_URL}/api/cards?sort=name_asc&per_page=10&cursor={next_cursor}"
+        )
+        assert response.status_code == 200
+        by_cursor = response.json()
+
+        response = requests.get(f"{BASE_URL}/api/cards?sort=name_asc&per_page=10&page=2")
+        by_page = response.json()
+
+        print(f"   [OK] Cursor page returned {len(by_cursor['cards'])} cards")
+        assert [c["id"] for c in by_cursor["cards"]] == [
+            c["id"] for c in by_page["cards"]
+        ]
+
+        # A cursor issued for one sort is rejected for another
+        response = requests.get(
+            f"{BASE_URL}/api/cards?sort=name_desc&per_page=10&cursor={next_cursor}"
+        )
+        assert response.status_code == 400
+
+    def test_cards_search_count_modes(self):
+        """Test the count=exact|estimate|none parameter"""
+        print(f"\n[TEST] Testing search count modes...")
+        exact = requests.get(f"{BASE_URL}/api/cards?q=r:rare&per_page=5").json()
+        assert exact["pagination"]["total_cards"] > 0
+        assert exact["pagination"]["total_is_estimate"] is False
+
+        response = requests.get(f"{BASE_URL}/api/cards?q=r:rare&per_page=5&count=none")
+        assert response.status_code == 200
+        data = response.json()
+        print(f"   [OK] count=none pagination: {data['pagination']}")
+        assert data["pagination"]["total_cards"] is None
+        assert data["pagination"]["has_next"] == exact["pagination"]["has_next"]
+
+        response = requests.get(
+            f"{BASE_URL}/api/cards?q=r:rare&per_page=5&count=estimate"
+        )
+        assert response.status_code == 200
+        assert response.json()["pagination"]["total_cards"] > 0
+
+        # Every page and sort of a search reports the same exact total,
+        # including a last page, which is counted from its own rows
+        total = exact["pagination"]["total_cards"]
+        for query in ("page=2", "sort=name_asc", f"page={(total + 4) // 5}", "page=9999"):
+            data = requests.get(f"{BASE_URL}/api/cards?q=r:rare&per_page=5&{query}").json()
+            assert data["pagination"]["total_cards"] == total
+
+        response = requests.get(f"{BASE_URL}/api/cards?count=sometimes")
+        assert response.status_code == 400
+
+    def test_cards_search_filter_order_and_unknown_fields(self):
+        """Test that filter order doesn't matter and unknown fields are rejected"""
+        print(f"\n[TEST] Testing search filter normalization...")
+        first = requests.get(
+            f"{BASE_URL}/api/cards?q=r:rare+-ct:action_point&per_page=5"
+        ).json()
+        second = requests.get(
+            f"{BASE_URL}/api/cards?q=-ct:Action_Point+r:RARE&per_page=5"
+        ).json()
+        assert [c["id"] for c in first["cards"]] == [c["id"] for c in second["cards"]]
+        assert first["pagination"]["total_cards"] == second["pagination"]["total_cards"]
+
+        response = requests.get(f"{BASE_URL}/api/cards?q=nosuchfield:1")
+        assert response.status_code == 400
+        print(f"   [OK] Unknown field rejected: {response.json()['error']}")
+
+    def test_cards_search_numeric_ranges(self):
+        """Test numeric range operators such as bp>=3000 and en<=2"""
+        print(f"\n[TEST] Testing numeric range filters...")
+        response = requests.get(f"{BASE_URL}/api/cards?q=bp>=3000+en<=2&per_page=50")
+        assert response.status_code == 200
+
+        cards = response.json()["cards"]
+        print(f"   [OK] Found {len(cards)} cards with bp>=3000 en<=2")
+        for card in cards:
+            assert int(card["battle_point"]) >= 3000
+            assert int(card["required_energy"]) <= 2
+
+        response = requests.get(f"{BASE_URL}/api/cards?q=r>=2")
+        assert response.status_code == 400
+
+        # Values beyond a 64-bit integer are rejected, not passed to the driver
+        for query in ("bp>=99999999999999999999", "price<-99999999999999999999.5"):
+            response = requests.get(f"{BASE_URL}/api/cards", params={"q": query})
+            assert response.status_code == 400
+            assert "out of range" in response.json()["error"]
+
+        # Words that merely contain an operator are name search terms
+        response = requests.get(f"{BASE_URL}/api/cards?q=abc=5")
+        assert response.status_code == 200
+
+    def test_cards_search_views(self):
+        """Test view=grid and fields= projections"""
+        print(f"\n[TEST] Testing search card projections...")
+        full = requests.get(f"{BASE_URL}/api/cards?per_page=10")
+        grid = requests.get(f"{BASE_URL}/api/cards?per_page=10&view=grid")
+        assert grid.status_code == 200
+        assert len(grid.content) < len(full.content)
+        print(f"   [OK] full={len(full.content)} bytes, grid={len(grid.content)} bytes")
+
+        full_cards = full.json()["cards"]
+        grid_cards = grid.json()["cards"]
+        assert [c["id"] for c in grid_cards] == [c["id"] for c in full_cards]
+        if grid_cards:
+            assert "attributes" not in grid_cards[0]
+            assert grid_cards[0]["name"] == full_cards[0]["name"]
+
+        fields = requests.get(f"{BASE_URL}/api/cards?per_page=10&fields=id,name").json()
+        for card in fields["cards"]:
+            assert set(card) <= {"id", "name"}
+
+        response = requests.get(f"{BASE_URL}/api/cards?view=tiny")
+        assert response.status_code == 400
+
+        # Unknown fields, and fields the chosen view doesn't load, are rejected
+        for query in ("fields=foo", "view=grid&fields=attributes", "view=grid&fields=id,card_text"):
+            response = requests.get(f"{BASE_URL}/api/cards?{query}")
+            assert response.status_code == 400
+            assert "card fields" in response.json()["error"]
+
+        # Fields only full cards have are served from the full view
+        full_fields = requests.get(f"{BASE_URL}/api/cards?per_page=10&fields=id,attributes")
+        assert full_fields.status_code == 200
+        for card in full_fields.json()["cards"]:
+            assert set(card) == {"id", "attributes"}
+
+        response = requests.post(
+            f"{BASE_URL}/api/cards/search/batch",
+            json={"searches": [{"fields": ["id", 5]}]},
+        )
+        assert response.status_code == 400
+
+    def test_cards_search_batch(self):
+        """Test that a batch search returns the same results as single searches"""
+        print(f"\n[TEST] Testing cards search batch endpoint...")
+        searches = [
+            {"q": "rarity:Rare", "per_page": 10},
+            {"q": "series:Bleach", "sort": "name_asc", "per_page": 5, "view": "grid"},
+            {"q": "rarity:Rare", "per_page": 10, "fields": ["id", "name"]},
+        ]
+        response = requests.post(
+            f"{BASE_URL}/api/cards/search/batch", json={"searches": searches}
+        )
+        assert response.status_code == 200
+
+        results = response.json()["results"]
+        print(f"   [OK] {len(results)} result sets")
+        assert len(results) == len(searches)
+
+        single = requests.get(f"{BASE_URL}/api/cards?q=rarity:Rare&per_page=10").json()
+        assert results[0] == single
+        assert [c["id"] for c in results[2]["cards"]] == [c["id"] for c in single["cards"]]
+        for card in results[2]["cards"]:
+            assert set(card) <= {"id", "name"}
+
+        response = requests.post(
+            f"{BASE_URL}/api/cards/search/batch",
+            json={"searches": [{"q": "rarity:Rare"}, {"count": "sometimes"}]},
+        )
+        assert response.status_code == 400
+        assert response.json()["error"].startswith("searches[1]")
+
+        for body in ([{"q": "x"}], 5, "searches"):
+            response = requests.post(f"{BASE_URL}/api/cards/search/batch", json=body)
+            assert response.status_code == 400
+            assert "error" in response.json()
+
+    def test_cards_facets(self):
+        """Test facet counts match the search they describe"""
+        print(f"\n[TEST] Testing cards facets endpoint...")
+        response = requests.get(f"{BASE_URL}/api/cards/facets?q=r:rare&basic_prints")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert "total_cards" in data
+        assert "rarity" in data["facets"]
+        print(f"   [OK] Facets for {data['total_cards']} cards: {list(data['facets'])}")
+
+        search = requests.get(f"{BASE_URL}/api/cards?q=r:rare&basic_prints").json()
+        assert data["total_cards"] == search["pagination"]["total_cards"]
+        if data["facets"]["card_type"]:
+            top = data["facets"]["card_type"][0]
+            narrowed = requests.get(
+                f"{BASE_URL}/api/cards",
+                params={"q": f"r:rare ct:{top['value'].replace(' ', '_')}", "basic_prints": ""},
+            ).json()
+            assert narrowed["pagination"]["total_cards"] == top["count"]
+
+        response = requests.get(f"{BASE_URL}/api/cards/facets?fields=rarity,nope")
+        assert response.status_code == 400
+
+        for bad in ("page=x", "per_page=abc"):
+            response = requests.get(f"{BASE_URL}/api/cards/facets?{bad}")
+            assert response.status_code == 400
+            assert "error" in response.json()
+
+    def test_cards_suggest(self):
+        """Test prefix autocomplete"""
+        print(f"\n[TEST] Testing cards suggest endpoint...")
+        cards = requests.get(f"{BASE_URL}/api/cards?per_page=1&sort=name_asc").json()["cards"]
+        if not cards:
+            return
+
+        prefix = cards[0]["name"][:3]
+        response = requests.get(f"{BASE_URL}/api/cards/suggest", params={"prefix": prefix})
+        assert response.status_code == 200
+
+        data = response.json()
+        print(f"   [OK] {len(data['suggestions'])} suggestions for '{prefix}'")
+        assert 0 < len(data["suggestions"]) <= 10
+        for suggestion in data["suggestions"]:
+            assert suggestion["type"] in ("name", "series", "card_number")
+
+        response = requests.get(f"{BASE_URL}/api/cards/suggest?prefix=")
+        assert response.json()["suggestions"] == []
+
+        # Limits are clamped to 1..10
+        for limit in (0, -3):
+            response = requests.get(
+                f"{BASE_URL}/api/cards/suggest", params={"prefix": prefix, "limit": limit}
+            )
+            assert response.json()["suggestions"] == data["suggestions"][:1]
+
     def test_cards_attributes_endpoint(self):
         """Test the cards attributes endpoint (renamed from /api/filter-fields)"""
         print(f"\n[TEST] Testing cards attributes endpoint...")
@@ -145,6 +402,54 @@ class TestPublicEndpoints:
         data = response.json()
         assert data == []
 
+    def test_catalog_etags(self):
+        """Test that catalog endpoints revalidate with the catalog ETag"""
+        print(f"\n[TEST] Testing catalog ETags...")
+        for path in [
+            "/api/cards?q=rarity:Rare",
+            "/api/cards/attributes",
+            "/api/cards/attributes/rarity",
+            "/api/games",
+            "/api/analytics",
+        ]:
+            response = requests.get(f"{BASE_URL}{path}")
+            assert response.status_code == 200
+            etag = response.headers.get("ETag")
+            assert etag
+            vary = response.headers.get("Vary")
+            cache_control = response.headers.get("Cache-Control")
+
+            response = requests.get(f"{BASE_URL}{path}", headers={"If-None-Match": etag})
+            print(f"   [OK] {path}: {etag} -> {response.status_code}")
+            assert response.status_code == 304
+            assert response.headers.get("ETag") == etag
+            assert response.content == b""
+            # Shared caches need the same Vary/Cache-Control as the 200
+            assert response.headers.get("Vary") == vary
+            assert response.headers.get("Cache-Control") == cache_control
+
+        # Errors are not cacheable
+        response = requests.get(f"{BASE_URL}/api/cards?q=color:red")
+        assert response.status_code == 400
+        assert "ETag" not in response.headers
+
+    def test_response_compression(self):
+        """Test that large API responses are compressed and small ones are not"""
+        print(f"\n[TEST] Testing response compression...")
+        response = requests.get(
+            f"{BASE_URL}/api/cards?per_page=50", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.status_code == 200
+        print(f"   [OK] Content-Encoding: {response.headers.get('Content-Encoding')}")
+        assert response.headers.get("Content-Encoding") == "gzip"
+        assert "Accept-Encoding" in response.headers.get("Vary", "")
+        assert len(response.json()["cards"]) > 0  # requests decodes gzip
+
+        response = requests.get(
+            f"{BASE_URL}/api/health", headers={"Accept-Encoding": "gzip"}
+        )
+        assert "Content-Encoding" not in response.headers
+
     def test_games_endpoint(self):
         """Test games endpoint"""
         print(f"\n[TEST] Testing games endpoint...")
@@ -549,6 +854,20 @@ class TestAdminEndpoints:
             f"   [OK] Unauthenticated admin scraping status request correctly returned 401: {data['error']}"
         )
 
+    def test_admin_performance_stats(self):
+        """Test admin performance stats endpoint"""
+        print(f"\n[TEST] Testing admin performance stats endpoint...")
+
+        # Test without authentication (should return 401)
+        response = requests.get(f"{BASE_URL}/api/admin/performance/stats")
+        assert response.status_code == 401
+
+        data = response.json()
+        assert "error" in data
+        print(
+            f"   [OK] Unauthenticated admin performance stats request correctly returned 401: {data['error']}"
+        )
+
     def test_admin_database_backup(self):
         """Test admin database backup endpoint"""
         print(f"\n[TEST] Testing admin database backup endpoint...")
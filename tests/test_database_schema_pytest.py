@@ -162,6 +162,32 @@ class TestDatabaseSchema:
         for expected_col in expected_columns:
             assert expected_col in columns
 
+    def test_card_prices_are_numeric(self, conn):
+        """Test that prices are stored as numbers, not strings"""
+        cursor = conn.execute(
+            text(
+                "SELECT column_name, data_type FROM information_schema.columns "
+                "WHERE (table_name='card_prices' AND column_name LIKE '%_price') "
+                "OR (table_name='card_search' AND column_name='price')"
+            )
+        )
+        types = dict(cursor.fetchall())
+        assert len(types) == 5
+        for column, data_type in types.items():
+            assert data_type == "numeric", f"{column} is {data_type}"
+
+    def test_one_price_row_per_card(self, conn):
+        """Test that card_prices holds at most one row per card"""
+        cursor = conn.execute(
+            text(
+                "SELECT indexdef FROM pg_indexes "
+                "WHERE tablename='card_prices' AND indexname='ux_card_prices_card_id'"
+            )
+        )
+        row = cursor.fetchone()
+        assert row is not None
+        assert "UNIQUE" in row[0]
+
     def test_card_prices_table_has_data(self, conn):
         """Test that card_prices table has data"""
         cursor = conn.execute(text("SELECT COUNT(*) FROM card_prices"))
@@ -240,6 +266,7 @@ class TestDatabaseSchema:
             "is_supplemental",
             "published_on",
             "modified_on",
+            "scraped_modified_on",
             "created_at",
         ]
 
@@ -343,6 +370,63 @@ class TestDatabaseSchema:
         assert count > 0
         assert count >= 40  # Should have at least 40 Union Arena groups
 
+    def test_card_search_table_schema(self, conn):
+        """Test card_search table has one column per searchable attribute"""
+        cursor = conn.execute(
+            text(
+                "SELECT column_name FROM information_schema.columns WHERE table_name='card_search' ORDER BY ordinal_position"
+            )
+        )
+        columns = [row[0] for row in cursor.fetchall()]
+
+        expected_columns = [
+            "card_id",
+            "rarity",
+            "series",
+            "card_type",
+            "activation_energy",
+            "required_energy",
+            "action_point_cost",
+            "battle_point",
+            "generated_energy",
+            "trigger_type",
+            "affinities",
+            "print_type",
+            "card_number",
+            "published_on",
+            "rarity_rank",
+            "card_number_int",
+            "required_energy_int",
+            "action_point_cost_int",
+            "battle_point_int",
+            "generated_energy_int",
+            "price",
+        ]
+
+        for expected_col in expected_columns:
+            assert expected_col in columns
+
+    def test_card_search_covers_all_cards(self, conn):
+        """Test that every card has a card_search row"""
+        cursor = conn.execute(
+            text(
+                """
+            SELECT COUNT(*) FROM cards c 
+            LEFT JOIN card_search cs ON cs.card_id = c.id 
+            WHERE cs.card_id IS NULL
+        """
+            )
+        )
+        missing = cursor.fetchone()[0]
+        assert missing == 0
+
+    def test_catalog_state_row(self, conn):
+        """Test that the catalog version row exists"""
+        cursor = conn.execute(text("SELECT version FROM catalog_state WHERE id = 1"))
+        row = cursor.fetchone()
+        assert row is not None
+        assert row[0] >= 1
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
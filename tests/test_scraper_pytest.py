@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Pytest test suite for the TCGCSV scraper's write path and incremental runs
+Runs against a throwaway SQLite database, no server or network needed
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+from sqlalchemy import text
+
+TEST_DATABASE = os.path.join(tempfile.mkdtemp(prefix="outdecked-scraper-"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{TEST_DATABASE}"
+
+# Add the backend to path to import the scraper
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend", "app"),
+)
+from database import db_manager
+from models import Base
+
+if db_manager.engine.url.database != TEST_DATABASE:
+    # database was imported earlier with another DATABASE_URL; never drop its tables
+    pytest.skip("database is not bound to the scraper test database", allow_module_level=True)
+
+import scraper
+
+
+def card_data(product_id, name="Test Card", price="1.50", mid_price="2.00", **attributes):
+    """Build card data the way TCGCSVScraper.save_group_cards does"""
+    return {
+        "name": name,
+        "clean_name": name.lower(),
+        "card_url": f"https://www.tcgplayer.com/product/{product_id}",
+        "game": "Union Arena",
+        "product_id": product_id,
+        "group_id": 1,
+        "category_id": 81,
+        "image_count": 1,
+        "is_presale": False,
+        "released_on": "",
+        "presale_note": "",
+        "modified_on": "2024-01-01T00:00:00",
+        "price": price,
+        "low_price": "",
+        "mid_price": mid_price,
+        "high_price": "",
+        "published_on": "2024-01-01T00:00:00",
+        "rarity": "Rare",
+        "card_number": f"UE01BT/TST-1-{product_id % 1000:03d}",
+        **attributes,
+    }
+
+
+def rows(query, **params):
+    with db_manager.engine.connect() as conn:
+        return conn.execute(text(query), params).fetchall()
+
+
+@pytest.fixture(autouse=True)
+def empty_database():
+    """Fresh tables for every test"""
+    Base.metadata.drop_all(db_manager.engine)
+    Base.metadata.create_all(db_manager.engine)
+    yield
+
+
+class TestSaveCardsBulk:
+    """Test scraper.save_cards_bulk"""
+
+    def test_inserts_cards_prices_attributes_and_search_rows(self):
+        written = scraper.save_cards_bulk([card_data(100), card_data(101, name="Other")])
+        # 2 cards + 2 prices + 4 attributes + 2 search rows
+        assert written == 10
+        assert rows("SELECT COUNT(*) FROM cards")[0][0] == 2
+        assert rows("SELECT COUNT(*) FROM card_attributes")[0][0] == 4
+        assert rows("SELECT rarity, price FROM card_search ORDER BY card_id") == [
+            ("Rare", 1.5),
+            ("Rare", 1.5),
+        ]
+
+    def test_existing_product_is_updated_not_duplicated(self):
+        scraper.save_cards_bulk([card_data(100, trigger_type="Draw")])
+        card_id = rows("SELECT id FROM cards WHERE product_id = 100")[0][0]
+
+        scraper.save_cards_bulk([card_data(100, name="Renamed", price="3.25", rarity="Super Rare")])
+
+        assert rows("SELECT id, name FROM cards") == [(card_id, "Renamed")]
+        assert rows("SELECT card_id, market_price FROM card_prices") == [(card_id, 3.25)]
+        # Attributes are replaced, so the dropped trigger_type is gone
+        assert rows("SELECT name, value FROM card_attributes ORDER BY name") == [
+            ("card_number", "UE01BT/TST-1-100"),
+            ("rarity", "Super Rare"),
+        ]
+        assert rows("SELECT card_id, rarity, price FROM card_search") == [
+            (card_id, "Super Rare", 3.25)
+        ]
+
+    def test_repeated_product_in_one_batch_keeps_last_listing(self):
+        # PostgreSQL rejects an upsert that touches the same row twice
+        written = scraper.save_cards_bulk(
+            [card_data(100, name="First", price="1.00"), card_data(100, name="Second", price="2.00")]
+        )
+
+        assert written == 5
+        assert rows("SELECT product_id, name FROM cards") == [(100, "Second")]
+        assert rows("SELECT market_price FROM card_prices") == [(2.0,)]
+        assert rows("SELECT COUNT(*) FROM card_search")[0][0] == 1
+
+    def test_price_row_created_for_card_without_one(self):
+        scraper.save_cards_bulk([card_data(100, price="", mid_price="")])
+        assert rows("SELECT COUNT(*) FROM card_prices")[0][0] == 0
+        assert rows("SELECT price FROM card_search") == [(None,)]
+
+        scraper.save_cards_bulk([card_data(100, price="4.00", mid_price="")])
+
+        assert rows("SELECT market_price, mid_price FROM card_prices") == [(4.0, None)]
+        assert rows("SELECT price FROM card_search") == [(4.0,)]
+
+    def test_missing_prices_keep_stored_values(self):
+        scraper.save_cards_bulk([card_data(100, price="4.00", mid_price="5.00")])
+        scraper.save_cards_bulk([card_data(100, price="", mid_price="6.00")])
+
+        assert rows("SELECT market_price, mid_price FROM card_prices") == [(4.0, 6.0)]
+        assert rows("SELECT price FROM card_search") == [(4.0,)]
+
+    def test_matches_single_card_save(self):
+        batch = [card_data(100 + i, name=f"Card {i}", price=str(i)) for i in range(5)]
+        scraper.save_cards_bulk(batch)
+        bulk = rows("SELECT * FROM card_search ORDER BY card_id")
+
+        Base.metadata.drop_all(db_manager.engine)
+        Base.metadata.create_all(db_manager.engine)
+        for data in batch:
+            scraper.save_card_to_db_sqlalchemy(data)
+        single = rows("SELECT * FROM card_search ORDER BY card_id")
+
+        # Everything but updated_at
+        assert [row[:-1] for row in bulk] == [row[:-1] for row in single]
+
+
+class FakeClock:
+    """Clock for TokenBucket whose sleep just advances time"""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket:
+    """Test scraper.TokenBucket with an injected clock"""
+
+    def test_burst_then_rate(self):
+        clock = FakeClock()
+        bucket = scraper.TokenBucket(2, capacity=3, clock=clock, sleep=clock.sleep)
+
+        # The full burst goes through without waiting
+        assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        # Then one token every 1/rate seconds
+        assert bucket.acquire() == pytest.approx(0.5)
+        assert bucket.acquire() == pytest.approx(0.5)
+        assert clock.sleeps == [pytest.approx(0.5), pytest.approx(0.5)]
+        assert bucket.waited == pytest.approx(1.0)
+
+    def test_refill_is_capped_at_capacity(self):
+        clock = FakeClock()
+        bucket = scraper.TokenBucket(2, capacity=3, clock=clock, sleep=clock.sleep)
+        for _ in range(3):
+            bucket.acquire()
+
+        # Idle for 10s: refills to capacity (3), not 20 tokens
+        clock.now += 10
+        assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.acquire() == pytest.approx(0.5)
+
+        # 0.25s after that wait ended, half a token has refilled
+        clock.now += 0.25
+        assert bucket.acquire() == pytest.approx(0.25)
+
+    def test_zero_or_negative_rate_is_unlimited(self):
+        for rate in (0, -1):
+            clock = FakeClock()
+            bucket = scraper.TokenBucket(rate, capacity=1, clock=clock, sleep=clock.sleep)
+            assert all(bucket.acquire() == 0.0 for _ in range(100))
+            assert clock.sleeps == []
+
+
+class TestFetchGroups:
+    """Test TCGCSVScraper._fetch_groups"""
+
+    @pytest.mark.parametrize("concurrency", [1, 4])
+    def test_results_stay_with_their_group(self, concurrency):
+        import random
+        import time
+
+        groups = [{"groupId": group_id, "name": f"Group {group_id}"} for group_id in range(20)]
+        tcgcsv = scraper.TCGCSVScraper(concurrency=concurrency, rate_limit=0)
+
+        def fetch_group(group_id, prices_only=False):
+            # Finish out of order
+            time.sleep(random.random() / 100)
+            return [{"productId": group_id * 1000}], [{"productId": group_id * 1000, "g": group_id}]
+
+        tcgcsv.fetch_group = fetch_group
+        results = list(tcgcsv._fetch_groups(groups))
+
+        assert sorted(group["groupId"] for group, _, _ in results) == list(range(20))
+        for group, products, prices in results:
+            assert products == [{"productId": group["groupId"] * 1000}]
+            assert prices[0]["g"] == group["groupId"]
+
+
+class IncrementalScrape:
+    """Helpers for running scrapes against canned TCGCSV responses"""
+
+    GROUP = {"groupId": 7, "name": "Test Set", "modifiedOn": "2024-01-01T00:00:00"}
+
+    def product(self, product_id, modified_on="2024-01-01T00:00:00"):
+        return {
+            "productId": product_id,
+            "name": f"Card {product_id}",
+            "cleanName": f"Card {product_id}",
+            "modifiedOn": modified_on,
+            "extendedData": [{"name": "Rarity", "value": "Rare"}],
+        }
+
+    def scrape(self, products, prices, group=None):
+        """Run an incremental scrape against canned TCGCSV responses"""
+        group = group or self.GROUP
+        responses = {
+            "https://tcgcsv.com/tcgplayer/81/groups": {"results": [group]},
+            "https://tcgcsv.com/tcgplayer/81/7/products": {"results": products},
+            "https://tcgcsv.com/tcgplayer/81/7/prices": {"results": prices},
+        }
+        tcgcsv = scraper.TCGCSVScraper(concurrency=1, rate_limit=0)
+        requested = []
+
+        def get_json(url):
+            requested.append(url)
+            return responses[url]
+
+        tcgcsv.client.get_json = get_json
+        tcgcsv.scrape_all_union_arena_cards()
+        return tcgcsv, requested
+
+    def add_group(self):
+        """Insert group 7 the way populate_categories_and_groups does"""
+        with db_manager.engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO groups (id, group_id, category_id, name, abbreviation, modified_on) "
+                    "VALUES (1, 7, 81, 'Test Set', 'TST', :modified_on)"
+                ),
+                {"modified_on": self.GROUP["modifiedOn"]},
+            )
+
+
+class TestIncrementalGroups(IncrementalScrape):
+    """Test which groups incremental scrapes skip"""
+
+    def test_partly_saved_group_is_rescraped(self, monkeypatch):
+        self.add_group()
+        products = [self.product(100), self.product(101)]
+        prices = [{"productId": 100, "marketPrice": 2.5}, {"productId": 101, "marketPrice": 3.0}]
+
+        # The bulk write fails and the per-card fallback loses product 101
+        def failing_bulk_save(cards_data):
+            raise RuntimeError("bulk save failed")
+
+        save_card = scraper.save_card_to_db_sqlalchemy
+        monkeypatch.setattr(scraper, "save_cards_bulk", failing_bulk_save)
+        monkeypatch.setattr(
+            scraper,
+            "save_card_to_db_sqlalchemy",
+            lambda card_data: 0 if card_data["product_id"] == 101 else save_card(card_data),
+        )
+        self.scrape(products, prices)
+        assert rows("SELECT product_id FROM cards") == [(100,)]
+        monkeypatch.undo()
+
+        # Same modifiedOn as when the group was added, but its cards weren't all saved
+        tcgcsv, requested = self.scrape(products, prices)
+
+        assert "https://tcgcsv.com/tcgplayer/81/7/products" in requested
+        assert tcgcsv.groups_processed == 1 and tcgcsv.groups_skipped == 0
+        assert rows("SELECT product_id FROM cards ORDER BY product_id") == [(100,), (101,)]
+
+        # Now that all of them are saved, the group is skipped
+        tcgcsv, _ = self.scrape(products, prices)
+        assert tcgcsv.groups_skipped == 1
+
+    def test_unscraped_group_is_scraped(self):
+        self.add_group()
+        tcgcsv, _ = self.scrape([self.product(100)], [])
+        assert tcgcsv.groups_processed == 1
+        assert rows("SELECT scraped_modified_on FROM groups") == [(self.GROUP["modifiedOn"],)]
+
+
+class TestCatalogVersion(IncrementalScrape):
+    """Test that a scrape bumps the catalog version once, not per group"""
+
+    def scrape_groups(self, monkeypatch, group_ids, market_price):
+        bumps = []
+        monkeypatch.setattr(scraper, "bump_catalog_version", lambda: bumps.append(1) or len(bumps))
+        responses = {
+            "https://tcgcsv.com/tcgplayer/81/groups": {
+                "results": [{**self.GROUP, "groupId": group_id} for group_id in group_ids]
+            }
+        }
+        for group_id in group_ids:
+            product_id = group_id * 100
+            responses[f"https://tcgcsv.com/tcgplayer/81/{group_id}/products"] = {
+                "results": [self.product(product_id)]
+            }
+            responses[f"https://tcgcsv.com/tcgplayer/81/{group_id}/prices"] = {
+                "results": [{"productId": product_id, "marketPrice": market_price}]
+            }
+        tcgcsv = scraper.TCGCSVScraper(concurrency=1, rate_limit=0)
+        tcgcsv.client.get_json = responses.get
+        tcgcsv.scrape_all_union_arena_cards()
+        return tcgcsv, len(bumps)
+
+    @pytest.fixture
+    def groups(self):
+        group_ids = [7, 8, 9]
+        with db_manager.engine.begin() as conn:
+            for group_id in group_ids:
+                conn.execute(
+                    text(
+                        "INSERT INTO groups (id, group_id, category_id, name) "
+                        "VALUES (:group_id, :group_id, 81, 'Test Set')"
+                    ),
+                    {"group_id": group_id},
+                )
+        return group_ids
+
+    def test_one_bump_per_scrape(self, monkeypatch, groups):
+        tcgcsv, bumps = self.scrape_groups(monkeypatch, groups, 1.0)
+        assert tcgcsv.groups_processed == 3
+        assert bumps == 1
+
+        # Price-only updates of unchanged groups are published once too
+        tcgcsv, bumps = self.scrape_groups(monkeypatch, groups, 2.0)
+        assert tcgcsv.groups_skipped == 3 and tcgcsv.prices_updated == 3
+        assert bumps == 1
+
+    def test_no_bump_without_changes(self, monkeypatch, groups):
+        self.scrape_groups(monkeypatch, groups, 1.0)
+        tcgcsv, bumps = self.scrape_groups(monkeypatch, groups, 1.0)
+        assert tcgcsv.groups_skipped == 3
+        assert bumps == 0
+
+    def test_saved_groups_are_published_when_a_fetch_fails(self, monkeypatch, groups):
+        bumps = []
+        monkeypatch.setattr(scraper, "bump_catalog_version", lambda: bumps.append(1) or len(bumps))
+        tcgcsv = scraper.TCGCSVScraper(concurrency=1, rate_limit=0)
+        tcgcsv.client.get_json = lambda url: {
+            "results": [{**self.GROUP, "groupId": group_id} for group_id in (7, 8)]
+        }
+
+        def failing_fetch_group(group_id, prices_only=False):
+            if group_id == 8:
+                raise RuntimeError("fetch failed")
+            return [self.product(700)], [{"productId": 700, "marketPrice": 1.0}]
+
+        tcgcsv.fetch_group = failing_fetch_group
+        with pytest.raises(RuntimeError):
+            tcgcsv.scrape_all_union_arena_cards()
+        assert tcgcsv.groups_processed == 1
+        assert bumps == [1]
+
+
+class TestIncrementalPrices(IncrementalScrape):
+    """Test that incremental scrapes keep prices of unchanged cards current"""
+
+    @pytest.fixture(autouse=True)
+    def saved_group(self, empty_database):
+        """Group 7 with products 100 and 101 saved at 2.50 and 3.00"""
+        self.add_group()
+        tcgcsv, _ = self.scrape(
+            [self.product(100), self.product(101)],
+            [
+                {"productId": 100, "marketPrice": 2.5, "midPrice": 3.0},
+                {"productId": 101, "marketPrice": 3.0, "midPrice": 3.5},
+            ],
+        )
+        assert tcgcsv.groups_processed == 1
+
+    def test_unchanged_group_still_gets_new_prices(self):
+        tcgcsv, requested = self.scrape(
+            [self.product(100), self.product(101)],
+            [
+                {"productId": 100, "marketPrice": 9.99, "midPrice": 3.0},
+                {"productId": 101, "marketPrice": 3.0, "midPrice": 3.5},
+            ],
+        )
+
+        # Only the prices of the skipped group are fetched
+        assert "https://tcgcsv.com/tcgplayer/81/7/products" not in requested
+        assert tcgcsv.groups_skipped == 1 and tcgcsv.groups_processed == 0
+        assert tcgcsv.prices_updated == 1
+        assert rows(
+            "SELECT c.product_id, p.market_price, s.price FROM cards c "
+            "JOIN card_prices p ON p.card_id = c.id "
+            "JOIN card_search s ON s.card_id = c.id ORDER BY c.product_id"
+        ) == [(100, 9.99, 9.99), (101, 3.0, 3.0)]
+
+    def test_unchanged_cards_in_changed_group_get_new_prices(self):
+        tcgcsv, _ = self.scrape(
+            [self.product(100), self.product(101, modified_on="2024-02-01T00:00:00")],
+            [
+                {"productId": 100, "marketPrice": None, "midPrice": 4.0},
+                {"productId": 101, "marketPrice": 5.0, "midPrice": 3.5},
+            ],
+            group={**self.GROUP, "modifiedOn": "2024-02-01T00:00:00"},
+        )
+
+        assert tcgcsv.cards_processed == 1 and tcgcsv.cards_skipped == 1
+        assert tcgcsv.prices_updated == 1
+        # A missing market price keeps the stored one
+        assert rows(
+            "SELECT c.product_id, p.market_price, p.mid_price, s.price FROM cards c "
+            "JOIN card_prices p ON p.card_id = c.id "
+            "JOIN card_search s ON s.card_id = c.id ORDER BY c.product_id"
+        ) == [(100, 2.5, 4.0, 2.5), (101, 5.0, 3.5, 5.0)]
+
+    def test_unchanged_prices_are_not_rewritten(self):
+        tcgcsv, _ = self.scrape(
+            [self.product(100), self.product(101)],
+            [
+                {"productId": 100, "marketPrice": "2.50", "midPrice": 3},
+                {"productId": 101, "marketPrice": 3.0},
+            ],
+        )
+        assert tcgcsv.prices_updated == 0
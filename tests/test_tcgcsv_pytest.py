@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Pytest test suite for the TCGCSV HTTP client
+Runs against a local HTTP server, no network needed
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add the backend to path to import the client
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend", "app"),
+)
+from config import Config
+from tcgcsv import TCGCSVClient
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Canned TCGCSV-like endpoints; every request is recorded on the server"""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, dict(self.headers)))
+            hits = sum(1 for path, _ in server.requests if path == self.path)
+
+        if self.path == "/etag":
+            if self.headers.get("If-None-Match") == ETAG:
+                return self.reply(304)
+            return self.reply(200, {"results": ["etag"]}, ETag=ETAG)
+        if self.path == "/last-modified":
+            if self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+                return self.reply(304)
+            return self.reply(200, {"results": ["last-modified"]}, **{"Last-Modified": LAST_MODIFIED})
+        if self.path == "/flaky":
+            # Fails twice, then recovers
+            if hits <= 2:
+                return self.reply(503)
+            return self.reply(200, {"results": ["flaky"]})
+        if self.path == "/slow":
+            # Times out once, then answers promptly
+            if hits == 1:
+                time.sleep(1)
+            return self.reply(200, {"results": ["slow"]})
+        if self.path == "/dropped":
+            # The first response is cut off mid-body, then it answers in full
+            if hits == 1:
+                return self.drop()
+            return self.reply(200, {"results": ["dropped"]})
+        if self.path == "/always-dropped":
+            return self.drop()
+        if self.path == "/hang":
+            time.sleep(1)
+            return self.reply(200, {"results": []})
+        if self.path == "/missing":
+            return self.reply(404)
+        self.reply(500)
+
+    def reply(self, status, body=None, **headers):
+        data = json.dumps(body).encode() if body is not None else b""
+        try:
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except OSError:
+            # The client gave up waiting
+            pass
+
+    def drop(self):
+        """Promise a body, send part of it and close the connection"""
+        self.send_response(200)
+        self.send_header("Content-Length", "1000")
+        self.end_headers()
+        self.wfile.write(b'{"results": [')
+        self.wfile.flush()
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    """Short timeouts and backoff so failures are retried quickly"""
+    monkeypatch.setattr(Config, "TCGCSV_READ_TIMEOUT", 0.3)
+    monkeypatch.setattr(Config, "TCGCSV_RETRIES", 3)
+    monkeypatch.setattr(Config, "TCGCSV_BACKOFF", 0.01)
+    monkeypatch.setattr(Config, "TCGCSV_BACKOFF_MAX", 0.05)
+
+
+def url(server, path):
+    return f"http://127.0.0.1:{server.server_port}{path}"
+
+
+def requests_to(server, path):
+    return [headers for request_path, headers in server.requests if request_path == path]
+
+
+class TestConditionalCache:
+    """Test that 304 responses are served from the disk cache"""
+
+    def test_etag_304_served_from_cache(self, server, tmp_path):
+        client = TCGCSVClient(cache_dir=str(tmp_path))
+
+        assert client.get_json(url(server, "/etag")) == {"results": ["etag"]}
+        assert client.get_json(url(server, "/etag")) == {"results": ["etag"]}
+
+        first, second = requests_to(server, "/etag")
+        assert "If-None-Match" not in first
+        assert second["If-None-Match"] == ETAG
+        assert client.stats["downloads"] == 1
+        assert client.stats["cache_hits"] == 1
+
+    def test_cache_outlives_the_client(self, server, tmp_path):
+        TCGCSVClient(cache_dir=str(tmp_path)).get_json(url(server, "/etag"))
+
+        client = TCGCSVClient(cache_dir=str(tmp_path))
+        assert client.get_json(url(server, "/etag")) == {"results": ["etag"]}
+        assert client.stats["cache_hits"] == 1
+        assert client.stats["downloads"] == 0
+
+    def test_last_modified_304_served_from_cache(self, server, tmp_path):
+        client = TCGCSVClient(cache_dir=str(tmp_path))
+
+        assert client.get_json(url(server, "/last-modified")) == {"results": ["last-modified"]}
+        assert client.get_json(url(server, "/last-modified")) == {"results": ["last-modified"]}
+
+        second = requests_to(server, "/last-modified")[1]
+        assert second["If-Modified-Since"] == LAST_MODIFIED
+        assert "If-None-Match" not in second
+        assert client.stats["cache_hits"] == 1
+
+    def test_caching_disabled(self, server):
+        client = TCGCSVClient(cache_dir="")
+
+        client.get_json(url(server, "/etag"))
+        client.get_json(url(server, "/etag"))
+
+        assert all("If-None-Match" not in headers for headers in requests_to(server, "/etag"))
+        assert client.stats["downloads"] == 2
+        assert client.stats["cache_hits"] == 0
+
+
+class TestRetries:
+    """Test retries on 5xx responses, timeouts and dropped connections"""
+
+    def test_5xx_is_retried(self, server, tmp_path):
+        client = TCGCSVClient(cache_dir=str(tmp_path))
+
+        assert client.get_json(url(server, "/flaky")) == {"results": ["flaky"]}
+        assert len(requests_to(server, "/flaky")) == 3
+        assert client.stats["retries"] == 2
+        assert client.stats["errors"] == 0
+
+    def test_5xx_gives_up_after_retries(self, server, tmp_path):
+        client = TCGCSVClient(cache_dir=str(tmp_path))
+
+        assert client.get_json(url(server, "/broken")) is None
+        assert len(requests_to(server, "/broken")) == Config.TCGCSV_RETRIES + 1
+        assert client.stats["errors"] == 1
+
+    def test_timeout_is_retried(self, server, tmp_path):
+        client = TCGCSVClient(cache_dir=str(tmp_path))
+
+        assert client.get_json(url(server, "/slow")) == {"results": ["slow"]}
+        assert client.stats["retries"] == 1
+        assert client.stats["errors"] == 0
+
+    def test_timeout_gives_up_after_retries(self, server, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, "TCGCSV_RETRIES", 1)
+        client = TCGCSVClient(cache_dir=str(tmp_path))
+
+        assert client.get_json(url(server, "/hang")) is None
+        assert client.stats["requests"] == 2
+        assert client.stats["retries"] == 1
+        assert client.stats["errors"] == 1
+
+    def test_dropped_body_is_retried(self, server, tmp_path):
+        client = TCGCSVClient(cache_dir=str(tmp_path))
+
+        assert client.get_json(url(server, "/dropped")) == {"results": ["dropped"]}
+        assert len(requests_to(server, "/dropped")) == 2
+        assert client.stats["retries"] == 1
+        assert client.stats["errors"] == 0
+
+    def test_dropped_body_gives_up_without_raising(self, server, tmp_path):
+        client = TCGCSVClient(cache_dir=str(tmp_path))
+
+        assert client.get_json(url(server, "/always-dropped")) is None
+        assert len(requests_to(server, "/always-dropped")) == Config.TCGCSV_RETRIES + 1
+        assert client.stats["errors"] == 1
+
+    def test_4xx_is_not_retried(self, server, tmp_path):
+        client = TCGCSVClient(cache_dir=str(tmp_path))
+
+        assert client.get_json(url(server, "/missing")) is None
+        assert len(requests_to(server, "/missing")) == 1
+        assert client.stats["retries"] == 0